@@ -0,0 +1,69 @@
+from collections import OrderedDict
+
+import pygame
+
+from asset_loader import LOADER
+
+
+class AssetCache:
+    """
+    Shared LRU cache of loaded / pre-scaled Surfaces and Sounds.
+    Keys are (source, size): source is a file path or the original Surface
+    (by identity), size is the target size or None for unscaled.
+    Cached Surfaces are shared between all users, so never draw onto them.
+    """
+
+    def __init__(self, max_items=512):
+        self.max_items = max_items
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, create):
+        """Return the cached value for key, building it with create() on a miss."""
+        try:
+            value = self.items[key]
+        except KeyError:
+            self.misses += 1
+            value = self.items[key] = create()
+            if len(self.items) > self.max_items:
+                self.items.popitem(last=False)  # least recently used
+            return value
+
+        self.hits += 1
+        self.items.move_to_end(key)
+        return value
+
+    # -----------------------------
+    # Typed helpers
+    # -----------------------------
+    def image(self, path, size=None):
+        """Image file converted for fast blitting (or its atlas view), optionally scaled."""
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+            return self.get((path, size), lambda: pygame.transform.scale(self.image(path), size))
+        return self.get((path, None), lambda: LOADER.image(path))
+
+    def scale(self, surface, size):
+        """Scaled copy of an already loaded Surface, shared by every caller."""
+        size = (int(size[0]), int(size[1]))
+        return self.get((surface, size), lambda: pygame.transform.scale(surface, size))
+
+    def sound(self, path):
+        return self.get((path, "sound"), lambda: pygame.mixer.Sound(path))
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "items": len(self.items),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        self.items.clear()
+
+
+# One cache for the whole game
+ASSETS = AssetCache()
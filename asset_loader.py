@@ -0,0 +1,163 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os.path import join
+
+import pygame
+
+ENEMY_DIR = join("assets", "images", "enemies")
+DIRECTIONS = ("up", "down", "left", "right")
+MAX_FRAMES = 10  # frame_0.png .. frame_9.png
+TOWERS_JSON = "assets/data/upgrades/towers.json"
+
+
+# -----------------------------
+# Manifests
+# -----------------------------
+def animation_manifest(folder):
+    """frame_N.png paths of one animation, in order, up to the first missing frame."""
+    try:
+        names = set(os.listdir(folder))
+    except FileNotFoundError:
+        return []
+
+    paths = []
+    for i in range(MAX_FRAMES):
+        name = f"frame_{i}.png"
+        if name not in names:
+            break
+        paths.append(join(folder, name))
+    return paths
+
+
+def enemy_manifest(enemy):
+    """{direction: [frame paths]} for one enemy type."""
+    return {direction: animation_manifest(join(ENEMY_DIR, enemy, direction)) for direction in DIRECTIONS}
+
+
+def tower_manifest(path=TOWERS_JSON):
+    """Every image file towers.json refers to (frames, projectile, menu icon)."""
+    with open(path, "r") as f:
+        data = json.load(f)
+
+    paths = []
+    for tdata in data.values():
+        folder = "assets/data/graphics/" + tdata["folder"]
+        for name in [tdata["idle"], *tdata["build"], *tdata["upgrades"]]:
+            paths.append(f"{folder}/{name}")
+        paths.append("assets/data/graphics/" + tdata["projectile"])
+        paths.append("assets/images/mapscreen/" + tdata["icon"])
+    return list(dict.fromkeys(paths))
+
+
+# Start / map / settings screen images, by group (TowerDefense.load_ui_images)
+UI_IMAGES = {
+    "startscreen": {
+        "start": join('assets', 'images', 'startscreen', 'Startscreen.png'),
+        "logo": join('assets', 'images', 'startscreen', 'logo.png'),
+        "play": join('assets', 'images', 'startscreen', 'play.png'),
+        "setting": join('assets', 'images', 'startscreen', 'settings.png'),
+        "exit": join('assets', 'images', 'startscreen', 'exit.png')},
+    "map_selection": {
+        "map": join('assets', 'images', 'mapscreen', 'map.png'),
+        "back": join('assets', 'images', 'mapscreen', 'back.png'),
+        "upgrade": join('assets', 'images', 'mapscreen', 'upgrade.png')},
+    "upgrades": {
+        "border": join('assets', 'images', 'mapscreen', 'border.png'),
+        "archer": join('assets', 'images', 'mapscreen', 'upgrades', 'archer.png'),
+        "stone": join('assets', 'images', 'mapscreen', 'upgrades', 'stone.png'),
+        "slingshot": join('assets', 'images', 'mapscreen', 'upgrades', 'slingshot.png'),
+        "bomb": join('assets', 'images', 'mapscreen', 'upgrades', 'bomb.png')},
+    "maps": {
+        "map1": join('assets', 'images', 'mapscreen', 'map1.png'),
+        "map2": join('assets', 'images', 'mapscreen', 'map2.png')},
+    "settings": {
+        "display": join('assets', 'images', 'startscreen', 'settings', 'display.png'),
+        "music": join('assets', 'images', 'startscreen', 'settings', 'music.png'),
+        "sfx": join('assets', 'images', 'startscreen', 'settings', 'sfx.png')},
+    "slider": {
+        "handle": join('assets', 'images', 'slider', 'slider_handle.png'),
+        "bar": join('assets', 'images', 'slider', 'slider_bar.png')},
+    "drop_down": {
+        "fullscreen": join('assets', 'images', 'startscreen', 'settings', 'fullscreen.png'),
+        "1280": join('assets', 'images', 'startscreen', 'settings', '1280x720.png'),
+        "1600": join('assets', 'images', 'startscreen', 'settings', '1600x900.png'),
+        "arrow": join('assets', 'images', 'startscreen', 'settings', 'arrow.png')},
+}
+
+
+# -----------------------------
+# Loader
+# -----------------------------
+class AssetLoader:
+    """
+    Decodes image files on a small thread pool. submit() queues paths as
+    early as possible; image() waits for the decode and converts on the
+    calling (main) thread, since convert_alpha needs the display.
+    Each queued path is decoded once.
+
+    With an atlas attached (use_atlas), packed images are handed out as
+    subsurface views of their sheet instead of being decoded one by one.
+    """
+
+    def __init__(self, workers=4):
+        self.workers = workers
+        self.pool = None
+        self.jobs = {}
+        self.atlas = None
+        self.sheets = {}  # sheet path -> converted sheet
+
+    def use_atlas(self, atlas):
+        self.atlas = atlas
+        self.sheets.clear()
+
+    def submit(self, paths):
+        for path in paths:
+            if self.atlas and path in self.atlas:
+                path = self.atlas.sheet_path(path)
+                if path in self.sheets:
+                    continue
+            if path in self.jobs:
+                continue
+            if self.pool is None:
+                self.pool = ThreadPoolExecutor(self.workers, thread_name_prefix="assets")
+            self.jobs[path] = self.pool.submit(pygame.image.load, path)
+
+    def load(self, path):
+        """Decoded, unconverted Surface (waits if it is still being decoded)."""
+        self.submit([path])
+        # Dropped once handed out: whoever asked keeps / caches the converted result
+        return self.jobs.pop(path).result()
+
+    def image(self, path):
+        if self.atlas and path in self.atlas:
+            sheet_path = self.atlas.sheet_path(path)
+            if sheet_path not in self.sheets:
+                self.sheets[sheet_path] = self.load(sheet_path).convert_alpha()
+            # A view into the sheet: scale / copy it, never draw onto it
+            return self.sheets[sheet_path].subsurface(self.atlas.rect(path))
+        return self.load(path).convert_alpha()
+
+
+class LoadTimer:
+    """Named wall-clock phases, for the startup report."""
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.mark = self.start
+        self.phases = []
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self.mark))
+        self.mark = now
+
+    def report(self, title="Startup"):
+        total = self.mark - self.start
+        parts = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases)
+        return f"{title}: {total * 1000:.0f} ms ({parts})"
+
+
+# One loader for the whole game
+LOADER = AssetLoader()
@@ -0,0 +1,190 @@
+"""
+Texture atlas: packs enemy frames, tower graphics and UI images into a few
+PNG sheets plus a JSON index of subrects.
+
+    python atlas.py            # (re)build assets/atlas if any source changed
+    python atlas.py --force    # rebuild regardless
+
+The build is deterministic (sorted sources, fixed packing order) and is
+skipped when the SHA-1 of every source matches the index. At runtime
+load_atlas() hands the index to the AssetLoader; images whose file changed
+since the build (size / mtime) are loaded from disk as before.
+"""
+import hashlib
+import json
+import os
+from os.path import join
+
+import pygame
+
+from asset_loader import ENEMY_DIR, UI_IMAGES, enemy_manifest, tower_manifest
+
+ATLAS_DIR = join("assets", "atlas")
+ATLAS_INDEX = join(ATLAS_DIR, "atlas.json")
+SHEET_SIZE = 2048
+MAX_PACKED = 512    # bigger images (screen art, buttons) gain nothing, they stay files
+PADDING = 2
+VERSION = 1
+
+
+# -----------------------------
+# Sources
+# -----------------------------
+def atlas_sources():
+    """
+    {sheet group: sorted paths}. Groups are loaded when first needed: "ui"
+    (menus + tower graphics) at startup, "enemies" with the first wave.
+    """
+    ui = [path for group in UI_IMAGES.values() for path in group.values()]
+    ui += tower_manifest()
+    enemies = []
+    for enemy in sorted(os.listdir(ENEMY_DIR)):
+        enemies += [path for frames in enemy_manifest(enemy).values() for path in frames]
+    return {"ui": sorted(set(ui)), "enemies": sorted(set(enemies) - set(ui))}
+
+
+def file_sha1(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def file_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+# -----------------------------
+# Packing
+# -----------------------------
+def pack(sizes):
+    """
+    Shelf packing. sizes: {path: (w, h)} -> ({path: (sheet, x, y)}, [sheet heights]).
+    Tallest first, ties broken by width then path, so the layout only
+    depends on the inputs.
+    """
+    order = sorted(sizes, key=lambda p: (-sizes[p][1], -sizes[p][0], p))
+    placed = {}
+    heights = []
+    sheet = x = y = shelf_h = 0
+
+    for path in order:
+        w, h = sizes[path][0] + PADDING, sizes[path][1] + PADDING
+        if x + w > SHEET_SIZE:               # next shelf
+            x, y, shelf_h = 0, y + shelf_h, 0
+        if y + h > SHEET_SIZE:               # next sheet
+            heights.append(y)
+            sheet, x, y, shelf_h = sheet + 1, 0, 0, 0
+        placed[path] = (sheet, x, y)
+        x += w
+        shelf_h = max(shelf_h, h)
+
+    heights.append(y + shelf_h)
+    return placed, heights
+
+
+def build(force=False):
+    groups = atlas_sources()
+    hashes = {path: file_sha1(path) for paths in groups.values() for path in paths}
+
+    if not force and os.path.exists(ATLAS_INDEX):
+        with open(ATLAS_INDEX, "r") as f:
+            old = json.load(f)
+        sheets_ok = all(os.path.exists(join(ATLAS_DIR, name)) for name in old.get("sheets", []))
+        if old.get("version") == VERSION and old.get("hashes") == hashes and sheets_ok:
+            print(f"Atlas up to date ({len(old['images'])} images)")
+            return old
+
+    os.makedirs(ATLAS_DIR, exist_ok=True)
+    index = {"version": VERSION, "sheets": [], "images": {}, "stamps": {}, "hashes": hashes}
+
+    for group, sources in groups.items():
+        images = {path: pygame.image.load(path) for path in sources}
+        sizes = {path: image.get_size() for path, image in images.items()
+                 if max(image.get_size()) <= MAX_PACKED}
+        placed, heights = pack(sizes)
+        first = len(index["sheets"])
+        sheets = [pygame.Surface((SHEET_SIZE, height), pygame.SRCALPHA) for height in heights]
+
+        for path, (sheet, x, y) in placed.items():
+            w, h = sizes[path]
+            # Onto fully transparent pixels a normal blit copies colour and alpha
+            # as-is. Colorkeyed pixels are skipped, so pre-fill them the way
+            # convert_alpha() would (key colour, alpha 0) for identical scaling.
+            colorkey = images[path].get_colorkey()
+            if colorkey:
+                sheets[sheet].fill((*colorkey[:3], 0), (x, y, w, h))
+            sheets[sheet].blit(images[path], (x, y))
+            index["images"][path] = [first + sheet, x, y, w, h]
+            index["stamps"][path] = file_stamp(path)
+
+        for i, surface in enumerate(sheets):
+            name = f"{group}_{i}.png"
+            pygame.image.save(surface, join(ATLAS_DIR, name))
+            index["sheets"].append(name)
+
+        print(f"Atlas {group}: {len(placed)} images in {len(sheets)} sheet(s), "
+              f"{len(sources) - len(placed)} left as files")
+
+    with open(ATLAS_INDEX, "w") as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    return index
+
+
+# -----------------------------
+# Runtime index
+# -----------------------------
+class Atlas:
+    """Which sheet and subrect each packed image lives in."""
+
+    def __init__(self, index, directory=ATLAS_DIR):
+        self.sheets = [join(directory, name) for name in index["sheets"]]
+        self.entries = {}
+        self.stale = 0
+
+        for path, (sheet, x, y, w, h) in index["images"].items():
+            # Edited since the build: load the file itself until the atlas is rebuilt
+            try:
+                fresh = file_stamp(path) == index["stamps"][path]
+            except OSError:
+                fresh = False
+            if fresh:
+                self.entries[path] = (self.sheets[sheet], pygame.Rect(x, y, w, h))
+            else:
+                self.stale += 1
+
+    def __contains__(self, path):
+        return path in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def sheet_path(self, path):
+        return self.entries[path][0]
+
+    def rect(self, path):
+        return self.entries[path][1]
+
+
+def load_atlas(path=ATLAS_INDEX):
+    """Atlas from a built index, or None if there is none."""
+    try:
+        with open(path, "r") as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        return None
+    if index.get("version") != VERSION:
+        return None
+
+    atlas = Atlas(index, os.path.dirname(path))
+    if atlas.stale:
+        print(f"Atlas: {atlas.stale} images changed since the build, run python atlas.py")
+    return atlas
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pack game images into texture atlas sheets.")
+    parser.add_argument("--force", action="store_true", help="rebuild even if no source changed")
+    args = parser.parse_args()
+    build(force=args.force)
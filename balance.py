@@ -0,0 +1,168 @@
+import os
+if __name__ == "__main__":
+    # Workers inherit these, so no process ever opens a window or audio device
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import io
+import csv
+import json
+import time
+import argparse
+import contextlib
+import multiprocessing
+from collections import defaultdict
+
+from simulation import Simulation, load_tower_data, MAP_PATH
+
+SCENARIO_PATH = os.path.join('assets', 'data', 'balance', 'default_scenario.json')
+
+
+def load_scenario(path=SCENARIO_PATH):
+    """
+    Scenario file: which towers to place, where, and from which wave on.
+    {"max_waves": 30, "max_minutes": 20,
+     "towers": [{"name": "Archer Tower", "pos": [300, 610], "wave": 0}, ...]}
+    """
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+# -----------------------------------------------
+# One complete game (runs inside a pool worker)
+# -----------------------------------------------
+def play_game(job):
+    seed, scenario, map_path = job
+    tower_data = load_tower_data()
+
+    # The game prints wave starts, castle hits...; nobody reads that in a batch run
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim = Simulation.from_tmx(map_path, seed=seed)
+
+        pending = sorted(scenario["towers"], key=lambda t: t.get("wave", 0))
+        max_waves = scenario.get("max_waves", 30)
+        max_ticks = int(scenario.get("max_minutes", 20) * 60 * sim.tick_rate)
+
+        castle_hp_curve = []
+        money_curve = []
+
+        while not sim.game_over and sim.tick < max_ticks:
+            wave = sim.wave_director.ai.wave_number - 1
+            if wave > max_waves:
+                break
+
+            # Scripted placements: buy each tower once its wave came and we can pay
+            while pending and pending[0].get("wave", 0) <= wave:
+                spec = pending[0]
+                if sim.build_tower(spec["name"], tuple(spec["pos"]), tower_data, buy=True) is None:
+                    break
+                pending.pop(0)
+
+            # Curves are sampled once per simulated second
+            if sim.tick % sim.tick_rate == 0:
+                castle_hp_curve.append(sim.main_castle.hp if sim.main_castle else None)
+                money_curve.append(sim.money_system.money)
+
+            sim.step()
+
+    kills = defaultdict(int)
+    for tower in sim.towers:
+        kills[tower.tower_type] += tower.kills
+
+    # The wave in progress when the game ended doesn't count
+    wave = sim.wave_director.ai.wave_number - 1
+    return {
+        "seed": seed,
+        "waves_survived": max(0, min(wave - 1, max_waves)),
+        "game_over": sim.game_over,
+        "seconds": round(sim.time, 2),
+        "castle_hp": sim.main_castle.hp if sim.main_castle else None,
+        "money": sim.money_system.money,
+        "towers_placed": len(sim.towers),
+        "kills": dict(kills),
+        "castle_hp_curve": castle_hp_curve,
+        "money_curve": money_curve,
+    }
+
+
+# -----------------------------------------------
+# Aggregation / report
+# -----------------------------------------------
+def mean_curve(curves):
+    """Average of per-second curves; games that ended early stop contributing."""
+    length = max((len(c) for c in curves), default=0)
+    result = []
+    for i in range(length):
+        values = [c[i] for c in curves if i < len(c) and c[i] is not None]
+        result.append(round(sum(values) / len(values), 2) if values else None)
+    return result
+
+
+def summarize(results):
+    waves = [r["waves_survived"] for r in results]
+    kills = defaultdict(int)
+    for r in results:
+        for tower_type, count in r["kills"].items():
+            kills[tower_type] += count
+
+    return {
+        "games": len(results),
+        "losses": sum(1 for r in results if r["game_over"]),
+        "waves_survived": {
+            "mean": round(sum(waves) / len(waves), 2) if waves else 0,
+            "min": min(waves, default=0),
+            "max": max(waves, default=0),
+        },
+        "kills_per_tower_type": dict(kills),
+        "castle_hp_curve": mean_curve([r["castle_hp_curve"] for r in results]),
+        "money_curve": mean_curve([r["money_curve"] for r in results]),
+    }
+
+
+def write_csv(path, results):
+    tower_types = sorted({t for r in results for t in r["kills"]})
+    fields = ["seed", "waves_survived", "game_over", "seconds", "castle_hp", "money", "towers_placed"]
+
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(fields + [f"kills_{t}" for t in tower_types])
+        for r in results:
+            writer.writerow([r[k] for k in fields] + [r["kills"].get(t, 0) for t in tower_types])
+
+
+def run_batch(seeds, scenario, map_path=MAP_PATH, workers=None):
+    jobs = [(seed, scenario, map_path) for seed in seeds]
+    with multiprocessing.Pool(processes=workers) as pool:
+        results = list(pool.imap_unordered(play_game, jobs, chunksize=max(1, len(jobs) // 64)))
+    results.sort(key=lambda r: r["seed"])
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play many headless games and report wave balance")
+    parser.add_argument("-n", "--games", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0, help="first seed, games use seed..seed+n-1")
+    parser.add_argument("--scenario", default=SCENARIO_PATH)
+    parser.add_argument("--map", default=MAP_PATH)
+    parser.add_argument("--workers", type=int, default=None, help="default: all CPU cores")
+    parser.add_argument("--json", default="balance_report.json")
+    parser.add_argument("--csv", default="balance_report.csv")
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario)
+    seeds = range(args.seed, args.seed + args.games)
+
+    start = time.perf_counter()
+    results = run_batch(seeds, scenario, args.map, args.workers)
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    with open(args.json, "w") as f:
+        json.dump({"scenario": scenario, "summary": summary, "games": results}, f, indent=4)
+    write_csv(args.csv, results)
+
+    print(f"{len(results)} games in {elapsed:.1f}s")
+    print(f"waves survived: mean {summary['waves_survived']['mean']}  "
+          f"min {summary['waves_survived']['min']}  max {summary['waves_survived']['max']}  "
+          f"losses {summary['losses']}/{summary['games']}")
+    print(f"kills per tower type: {summary['kills_per_tower_type']}")
+    print(f"report: {args.json}, {args.csv}")
@@ -0,0 +1,67 @@
+"""
+Map drawing: one sprite per tile/object vs the baked static background.
+
+    python benchmarks/bench_background.py
+
+Builds finals.tmx the way TowerDefense.setup() does and times a frame of
+AllSprite.draw() for both layouts (map only, no monsters).
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from settings import *
+from sprites import AllSprite, Sprites, Objects, bake_static_layer
+from castle import CastleBox
+
+GAME_W, GAME_H = 1280, 720
+FRAMES = 200
+
+
+def build_map_sprites(group):
+    tmx_data = load_pygame(join('assets', 'data', 'tmx', 'finals.tmx'))
+    for x, y, image in tmx_data.get_layer_by_name("Ground").tiles():
+        Sprites((x * TILE_SIZE, y * TILE_SIZE), image, group)
+    for obj in tmx_data.get_layer_by_name("castle"):
+        if obj.image is not None:
+            CastleBox((obj.x, obj.y), obj.width, obj.height, group, image=obj.image)
+    for layer_name in ["House", "decoration", "fences"]:
+        for obj in tmx_data.get_layer_by_name(layer_name):
+            Objects((obj.x, obj.y), obj.image, (obj.width, obj.height), obj.rotation, group)
+
+
+def time_frames(group, surface):
+    group.set_target_surface(surface)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        surface.fill("grey")
+        group.draw()
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((GAME_W, GAME_H))
+    surface = pygame.Surface((GAME_W, GAME_H))
+
+    per_sprite = AllSprite(GAME_W, GAME_H)
+    build_map_sprites(per_sprite)
+
+    baked = AllSprite(GAME_W, GAME_H)
+    baked.set_background(bake_static_layer(per_sprite, (GAME_W, GAME_H)))
+
+    before = time_frames(per_sprite, surface)
+    after = time_frames(baked, surface)
+    print(f"{len(per_sprite)} static sprites, {FRAMES} frames")
+    print(f"per-sprite draw : {before:6.2f} ms/frame")
+    print(f"baked background: {after:6.2f} ms/frame  ({before / after:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
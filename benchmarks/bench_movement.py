@@ -0,0 +1,72 @@
+"""
+Monster movement: per-sprite Monster.move vs the NumPy MonsterStore.
+
+    python benchmarks/bench_movement.py
+
+Headless monsters on the finals.tmx path, 60 ticks each. "per-sprite" is
+the normal Monster.update loop; "store" is MonsterStore.step() plus the
+thin StoredMonster.update loop; "store.step" is the vectorized pass alone.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+from monsters import Monster
+from monster_store import MonsterStore, StoredMonster
+from simulation import Simulation
+
+TICKS = 60
+TYPES = ("grunt", "fast", "tank", "flying", "swarm")
+
+
+def bench_per_sprite(waypoints, count):
+    group = pygame.sprite.Group()
+    for i in range(count):
+        Monster(TYPES[i % len(TYPES)], waypoints, group, headless=True)
+
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        group.update(1 / 60)
+    return (time.perf_counter() - start) / TICKS
+
+
+def bench_store(waypoints, count):
+    store = MonsterStore(waypoints)
+    group = pygame.sprite.Group()
+    for i in range(count):
+        StoredMonster(TYPES[i % len(TYPES)], waypoints, group, store, headless=True)
+
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        store.step()
+        group.update(1 / 60)
+    full = (time.perf_counter() - start) / TICKS
+
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        store.step()
+    step_only = (time.perf_counter() - start) / TICKS
+    return full, step_only
+
+
+def main():
+    waypoints = Simulation.from_tmx().waypoints
+
+    print(f"ms per tick (ticks/s), {TICKS} ticks")
+    print(f"{'monsters':>10}{'per-sprite':>20}{'store':>20}{'store.step':>20}")
+    for count in (1000, 10000, 20000):
+        per_sprite = bench_per_sprite(waypoints, count)
+        full, step_only = bench_store(waypoints, count)
+        cells = [f"{t * 1000:8.2f} ({1 / t:6.0f})" for t in (per_sprite, full, step_only)]
+        print(f"{count:>10}" + "".join(f"{c:>20}" for c in cells))
+
+
+if __name__ == "__main__":
+    main()
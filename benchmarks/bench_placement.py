@@ -0,0 +1,85 @@
+"""
+Tower placement check: tile-list + tower-list scan vs PlacementGrid.
+
+    python benchmarks/bench_placement.py
+
+finals.tmx ground layer, 0..60 towers already placed, random drag
+positions over the map (the preview calls can_place_tower every frame).
+Both versions are checked to give the same answers.
+"""
+import os
+import sys
+import time
+import random
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+from settings import TILE_SIZE
+from map_bundle import load_map_bundle
+from placement import PlacementGrid
+from simulation import MAP_PATH
+
+SIZE = (64, 64)
+CHECKS = 5000
+
+
+class Placed:
+    def __init__(self, rect):
+        self.rect = rect
+
+
+def tower_rect(pos, size=SIZE):
+    px, py = pos
+    w, h = size
+    return pygame.Rect(px - w//2, py - h, w, h)
+
+
+def scan_can_place(rect, grass_tiles, towers):
+    """The old can_place_tower body."""
+    corners = [(rect.left, rect.top), (rect.right, rect.top), (rect.left, rect.bottom),
+               (rect.right, rect.bottom), (rect.centerx, rect.bottom)]
+    if not any(tile["id"] == 1 and tile["rect"].collidepoint(c) for tile in grass_tiles for c in corners):
+        return False
+    return not any(rect.colliderect(t.rect) for t in towers)
+
+
+def main():
+    game_map = load_map_bundle(MAP_PATH)
+    grass_tiles = []
+    for y, row in enumerate(game_map.ground):
+        for x, gid in enumerate(row):
+            if gid:
+                grass_tiles.append({"rect": pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE), "id": gid})
+
+    w, h = game_map.size
+    rng = random.Random(1)
+    positions = [(rng.random() * w, rng.random() * h) for _ in range(CHECKS)]
+
+    for count in (0, 20, 60):
+        grid = PlacementGrid(game_map.ground)
+        towers = []
+        while len(towers) < count:
+            pos = (rng.random() * w, rng.random() * h)
+            if grid.can_place(tower_rect(pos)):
+                tower = Placed(pygame.Rect(0, 0, *SIZE))
+                tower.rect.center = pos
+                towers.append(tower)
+                grid.add(tower)
+
+        start = time.perf_counter()
+        old = [scan_can_place(tower_rect(p), grass_tiles, towers) for p in positions]
+        scan = (time.perf_counter() - start) / CHECKS * 1e6
+
+        start = time.perf_counter()
+        new = [grid.can_place(tower_rect(p)) for p in positions]
+        fast = (time.perf_counter() - start) / CHECKS * 1e6
+
+        assert old == new, "PlacementGrid disagrees with the scan"
+        print(f"{count:>3} towers  scan: {scan:7.1f} us/check   grid: {fast:5.1f} us/check ({scan / fast:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Presenting a frame: full smoothscale + display.update() vs DirtyRectRenderer.
+
+    python benchmarks/bench_present.py
+
+finals.tmx background at 1280x720, presented to a 1600x900 window (the
+"1600x900" resolution setting) with a few dozen monster-sized sprites
+walking across it plus the HUD panel redrawn every frame.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from settings import *
+from sprites import AllSprite, bake_static_layer
+from renderer import DirtyRectRenderer, present_full
+from bench_background import build_map_sprites
+
+GAME_W, GAME_H = 1280, 720
+WINDOW = (1600, 900)
+FRAMES = 200
+HUD = pygame.Rect(GAME_W - 400, GAME_H - 125, 380, 125)
+
+
+def make_walkers(count):
+    image = pygame.Surface((32, 32))
+    image.fill((200, 40, 40))
+    walkers = []
+    for i in range(count):
+        sprite = pygame.sprite.Sprite()
+        sprite.image = image
+        sprite.rect = image.get_rect(topleft=(40 + (i % 10) * 110, 120 + (i // 10) * 90))
+        walkers.append(sprite)
+    return walkers
+
+
+def draw_frame(surface, walkers, frame):
+    for sprite in walkers:
+        sprite.rect.x = (sprite.rect.x + 2) % GAME_W
+        surface.blit(sprite.image, sprite.rect)
+    pygame.draw.rect(surface, (60, 40, 30), HUD, border_radius=12)
+    return frame // 60  # the HUD text only changes once a second
+
+
+def time_full(background, surface, screen, walkers):
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        surface.blit(background, (0, 0))
+        draw_frame(surface, walkers, frame)
+        present_full(surface, screen)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def time_dirty(background, surface, screen, walkers):
+    renderer = DirtyRectRenderer(GAME_W, GAME_H)
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        renderer.restore(surface, background)
+        state = draw_frame(surface, walkers, frame)
+        for sprite in walkers:
+            renderer.mark(sprite.rect)
+        renderer.mark_static("hud", HUD, state)
+        renderer.present(surface, screen)
+    return (time.perf_counter() - start) / FRAMES * 1000, renderer
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode(WINDOW)
+    surface = pygame.Surface((GAME_W, GAME_H))
+
+    static = AllSprite(GAME_W, GAME_H)
+    build_map_sprites(static)
+    background = bake_static_layer(static, (GAME_W, GAME_H))
+
+    print(f"{GAME_W}x{GAME_H} -> {WINDOW[0]}x{WINDOW[1]}, {FRAMES} frames")
+    for count in (10, 40):
+        full = time_full(background, surface, screen, make_walkers(count))
+        dirty, renderer = time_dirty(background, surface, screen, make_walkers(count))
+        print(f"{count:>3} sprites  full: {full:6.2f} ms/frame   dirty: {dirty:6.2f} ms/frame "
+              f"({full / dirty:.1f}x, {renderer.rect_count} rects, {renderer.pixels // 1000}k px)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Tower targeting cost: full monster scan vs SpatialGrid.
+
+    python benchmarks/bench_targeting.py
+
+50 towers, 500..4000 monsters. "spread" scatters monsters over the whole
+1280x720 map, so the monsters near each tower stay a small fraction of the
+total; "clustered" packs every monster into a 200x200 square in range of
+the towers, which is the worst case for the grid.
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from tower import Tower
+from spatial import SpatialGrid
+
+GAME_W, GAME_H = 1280, 720
+TOWERS = 50
+REPEAT = 5
+
+
+def make_monsters(count, area, rng):
+    x0, y0, w, h = area
+    monsters = pygame.sprite.Group()
+    for _ in range(count):
+        m = pygame.sprite.Sprite(monsters)
+        m.rect = pygame.Rect(0, 0, 32, 32)
+        m.rect.center = (x0 + rng.random() * w, y0 + rng.random() * h)
+    return monsters
+
+
+def make_towers(count, rng):
+    towers = []
+    for _ in range(count):
+        pos = (rng.random() * GAME_W, rng.random() * GAME_H)
+        towers.append(Tower(pos, [None], [None], [None], range_=150, headless=True))
+    return towers
+
+
+def time_targeting(towers, monsters, grid=None):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        if grid is not None:
+            grid.rebuild(monsters)  # counted: the game rebuilds once per tick
+        for tower in towers:
+            tower.get_target(monsters, grid)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    rng = random.Random(42)
+    towers = make_towers(TOWERS, rng)
+    grid = SpatialGrid()
+
+    print(f"{TOWERS} towers, best of {REPEAT} (ms per tick)")
+    print(f"{'layout':<10}{'monsters':>10}{'scan':>10}{'grid':>10}{'speedup':>10}")
+    for layout, area in (("spread", (0, 0, GAME_W, GAME_H)), ("clustered", (540, 260, 200, 200))):
+        for count in (500, 1000, 2000, 4000):
+            monsters = make_monsters(count, area, rng)
+            scan = time_targeting(towers, monsters)
+            gridded = time_targeting(towers, monsters, grid)
+            print(f"{layout:<10}{count:>10}{scan:>10.2f}{gridded:>10.2f}{scan / gridded:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+"""
+Benchmark suite for the game's hot paths, headless (SDL dummy drivers).
+
+    python benchmarks/suite.py                      # run all, write results/latest.json
+    python benchmarks/suite.py --quick              # skip the 10,000 monster / 200 tower sizes
+    python benchmarks/suite.py -k targeting -k step # only cases whose name contains these
+    python benchmarks/suite.py --save-baseline      # ... and keep this run as the baseline
+    python benchmarks/suite.py --threshold 0.2      # allowed slowdown vs baseline (default 15%)
+
+Cases (ms per op, median of ROUNDS rounds):
+    targeting         SpatialGrid.rebuild + Tower.get_target for every tower
+    monsters.update   Monster.move + animate (with frames) for every monster
+    projectiles.update  Projectile.update for in-flight projectiles
+    placement         1,000 can_place_tower checks (PlacementGrid), towers placed
+    draw              AllSprite.draw: background + every monster
+    hud               TowerDefense.draw_right_hud, money changing every frame
+    simulation.step   one full headless Simulation tick
+    endless.wave      EndlessEnemyAI.generate_wave + compile_wave at wave 30..75
+    coverage          wave-start counter pick with the CoverageMap rebuilt (towers changed)
+
+Every scenario is built from fixed seeds, monsters are spread along the
+finals.tmx path and never die, so the same work is measured every run.
+With a baseline (benchmarks/results/baseline.json) each result is compared
+and the exit status is 1 if anything got slower than the threshold.
+Baselines only mean something on the machine that recorded them.
+"""
+import os
+import sys
+import io
+import gc
+import json
+import time
+import bisect
+import random
+import argparse
+import platform
+import statistics
+import contextlib
+import subprocess
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+from monsters import Monster
+from tower import Tower
+from projectile import Projectile
+from placement import PlacementGrid
+from spatial import SpatialGrid
+from sprites import AllSprite
+from simulation import Simulation, load_tower_data, MAP_PATH
+from map_bundle import load_map_bundle
+from game_ai import EndlessEnemyAI, TowerDefenseEnemyAI
+from coverage import CoverageMap
+from wave_compiler import compile_wave
+
+RESULTS_DIR = os.path.join("benchmarks", "results")
+LATEST = os.path.join(RESULTS_DIR, "latest.json")
+BASELINE = os.path.join(RESULTS_DIR, "baseline.json")
+GAME_W, GAME_H = 1280, 720
+ROUNDS = 5
+THRESHOLD = 0.15
+SEED = 1234
+
+MONSTERS = (10, 100, 1000, 10000)
+TOWERS = (5, 50, 200)
+TYPES = ("grunt", "fast", "tank", "flying", "swarm")
+WAVES = (30, 50, 60, 75)  # endless waves: ~80 / ~700 / ~2,200 / ~12,000 enemies
+
+
+def loops_for(work, budget=20000, low=3, high=200):
+    """Ops per round: fewer for bigger scenarios, fixed per size so runs compare."""
+    return max(low, min(high, budget // max(work, 1)))
+
+
+# -----------------------------
+# Scenario helpers
+# -----------------------------
+class Scene:
+    """Map data shared by every case (loaded once)."""
+
+    def __init__(self):
+        self.sim = Simulation.from_tmx(seed=SEED)
+        self.waypoints = self.sim.waypoints
+        self.path = self.sim.path
+        self.map = load_map_bundle(MAP_PATH, background_size=(GAME_W, GAME_H))
+        self.tower_data = load_tower_data()
+
+
+def spread_on_path(monster, path, distance):
+    """Put a fresh monster `distance` pixels along the path, walking on."""
+    i = max(1, bisect.bisect_right(path.cumulative, distance))
+    i = min(i, len(path.waypoints) - 1)
+    (x0, y0), (x1, y1) = path.waypoints[i - 1], path.waypoints[i]
+    seg = path.cumulative[i] - path.cumulative[i - 1]
+    t = (distance - path.cumulative[i - 1]) / seg if seg else 0.0
+    monster.pos = pygame.Vector2(x0 + (x1 - x0) * t, y0 + (y1 - y0) * t)
+    monster.target_waypoint = i
+    monster.distance = distance
+    monster.rect.center = monster.pos
+
+
+def make_monsters(scene, count, group, rng, headless=True):
+    monsters = []
+    for i in range(count):
+        m = Monster(TYPES[i % len(TYPES)], scene.waypoints, group, headless=headless, path=scene.path)
+        m.hp = m.max_hp = 10**9  # nobody dies mid-benchmark
+        m.type = TYPES[i % len(TYPES)]
+        # Keep clear of the castle so the population stays the same
+        spread_on_path(m, scene.path, rng.random() * scene.path.length * 0.8)
+        monsters.append(m)
+    return monsters
+
+
+def random_pos(rng):
+    return (rng.random() * GAME_W, rng.random() * GAME_H)
+
+
+def make_towers(scene, count, rng):
+    names = list(scene.tower_data)
+    towers = []
+    for i in range(count):
+        tdata = scene.tower_data[names[i % len(names)]]
+        towers.append(Tower(random_pos(rng), [None], [None] * len(tdata["build"]),
+                            [None] * len(tdata["upgrades"]), damage=tdata["damage"],
+                            range_=tdata["range"], fire_rate=tdata["fire_rate"],
+                            projectile_speed=tdata["projectile_speed"], size=tuple(tdata["size"]),
+                            tower_type=names[i % len(names)].lower().replace(" ", "_"),
+                            headless=True, targeting=tdata.get("targeting", "nearest")))
+    return towers
+
+
+# -----------------------------
+# Cases: setup(scene, **params) -> (op, loops), called once per round
+# -----------------------------
+def case_targeting(scene, monsters, towers):
+    rng = random.Random(SEED)
+    group = pygame.sprite.Group()
+    make_monsters(scene, monsters, group, rng)
+    tower_list = make_towers(scene, towers, rng)
+    grid = SpatialGrid()
+
+    def op():
+        grid.rebuild(group)
+        for tower in tower_list:
+            tower.get_target(group, grid)
+    return op, loops_for(monsters + towers * 20)
+
+
+def case_monsters_update(scene, monsters):
+    rng = random.Random(SEED)
+    group = pygame.sprite.Group()
+    make_monsters(scene, monsters, group, rng, headless=False)
+
+    def op():
+        group.update(1 / 60)
+    return op, loops_for(monsters * 4, high=60)
+
+
+class Target(pygame.sprite.Sprite):
+    """Stand-in target: alive, never hit (projectiles start far away)."""
+
+    def __init__(self, pos, group):
+        super().__init__(group)
+        self.rect = pygame.Rect(0, 0, 32, 32)
+        self.rect.center = pos
+
+
+def case_projectiles_update(scene, projectiles):
+    rng = random.Random(SEED)
+    targets = pygame.sprite.Group()
+    group = pygame.sprite.Group()
+    for i in range(projectiles):
+        target = Target(random_pos(rng), targets)
+        # 600 px away at 300 px/s: 2 s of flight, more than a round lasts
+        angle = rng.random() * 6.283
+        start = pygame.Vector2(target.rect.center) + pygame.Vector2(600, 0).rotate_rad(angle)
+        Projectile(start, target, 1, speed=300, groups=group, headless=True)
+
+    def op():
+        group.update(1 / 60)
+    return op, loops_for(projectiles * 4, high=60)
+
+
+def case_placement(scene, towers):
+    rng = random.Random(SEED)
+    grid = PlacementGrid(scene.map.ground)
+    placed = 0
+    for _ in range(20000):  # as many as fit, up to `towers`
+        if placed >= towers:
+            break
+        px, py = random_pos(rng)
+        rect = pygame.Rect(px - 32, py - 64, 64, 64)
+        if grid.can_place(rect):
+            tower = Tower((px, py), [None], [None], [None], headless=True)
+            grid.add(tower)
+            placed += 1
+    checks = [random_pos(rng) for _ in range(1000)]
+
+    def op():
+        for px, py in checks:
+            grid.can_place(pygame.Rect(px - 32, py - 64, 64, 64))
+    return op, 20
+
+
+def case_draw(scene, monsters):
+    rng = random.Random(SEED)
+    surface = pygame.Surface((GAME_W, GAME_H))
+    group = AllSprite(GAME_W, GAME_H)
+    group.set_background(scene.map.background)
+    group.set_target_surface(surface)
+    make_monsters(scene, monsters, group, rng, headless=False)
+
+    def op():
+        group.draw()
+    return op, loops_for(monsters * 2, high=60)
+
+
+_GAME = None
+
+
+def tower_defense():
+    """One real TowerDefense (window, HUD fonts, castles) for the HUD case."""
+    global _GAME
+    if _GAME is None:
+        import main
+        with contextlib.redirect_stdout(io.StringIO()):
+            _GAME = main.TowerDefense()
+            _GAME.setup()
+    return _GAME
+
+
+def case_hud(scene):
+    game = tower_defense()
+    surface = pygame.Surface((GAME_W, GAME_H))
+    money = game.money_system
+
+    def op():
+        money._money += 1  # one changed line per frame, the rest from the text cache
+        game.draw_right_hud(surface)
+    return op, 200
+
+
+def case_simulation_step(scene, monsters, towers):
+    rng = random.Random(SEED)
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim = Simulation.from_tmx(seed=SEED)
+        sim.main_castle.hp = 10**9
+        for m in make_monsters(scene, monsters, sim.world, rng):
+            sim.monsters.add(m)
+        for tower in make_towers(scene, towers, rng):
+            tower.state = "idle"  # skip the build animation, shoot from the start
+            sim.add_tower(tower)
+        sim.wave_director.update = lambda dt, towers: None  # fixed population, no new waves
+
+    def op():
+        with contextlib.redirect_stdout(io.StringIO()):
+            sim.step()
+    return op, loops_for(monsters + towers * 20, high=60)
+
+
+def case_endless_wave(scene, wave):
+    ai = EndlessEnemyAI(random.Random(SEED), clock=lambda: 0.0)
+
+    def op():
+        ai.rng.seed(SEED)
+        ai.wave_number = wave
+        enemies = ai.generate_wave([], force=True)
+        compile_wave(enemies, times=ai.spawn_times(enemies))
+    return op, loops_for(wave ** 2, high=60)
+
+
+def case_coverage(scene, towers):
+    rng = random.Random(SEED)
+    placed = make_towers(scene, towers, rng)
+    ai = TowerDefenseEnemyAI(random.Random(SEED), clock=lambda: 0.0)
+    ai.coverage = CoverageMap(scene.path)
+    wave = ["grunt", "grunt", "fast", "grunt"]
+
+    def op():
+        ai.coverage.signature = None  # as if a tower was just placed
+        ai.adapt(placed, wave)
+    return op, loops_for(towers * 20)
+
+
+CASES = [
+    ("targeting", case_targeting, {"monsters": MONSTERS, "towers": TOWERS}),
+    ("monsters.update", case_monsters_update, {"monsters": MONSTERS}),
+    ("projectiles.update", case_projectiles_update, {"projectiles": MONSTERS}),
+    ("placement", case_placement, {"towers": TOWERS}),
+    ("draw", case_draw, {"monsters": MONSTERS}),
+    ("hud", case_hud, {}),
+    ("simulation.step", case_simulation_step, {"monsters": MONSTERS, "towers": TOWERS}),
+    ("endless.wave", case_endless_wave, {"wave": WAVES}),
+    ("coverage", case_coverage, {"towers": TOWERS}),
+]
+
+
+# -----------------------------
+# Running
+# -----------------------------
+def param_grid(params, quick):
+    grid = [{}]
+    for name, values in params.items():
+        if quick:
+            values = [v for v in values if v < 10000 and not (name == "towers" and v > 50)]
+        grid = [dict(g, **{name: v}) for g in grid for v in values]
+    return grid
+
+
+def result_key(name, params):
+    if not params:
+        return name
+    return f"{name}[" + ",".join(f"{k}={v}" for k, v in params.items()) + "]"
+
+
+def measure(setup, rounds=ROUNDS):
+    times = []
+    loops = 0
+    for _ in range(rounds):
+        op, loops = setup()
+        op()  # warm up (first-frame caches, lazy loads)
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(loops):
+                op()
+            times.append((time.perf_counter() - start) / loops * 1000)
+        finally:
+            gc.enable()
+    return {"median_ms": statistics.median(times), "min_ms": min(times), "loops": loops, "rounds": rounds}
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(filters=(), quick=False, rounds=ROUNDS):
+    pygame.init()
+    pygame.display.set_mode((GAME_W, GAME_H))
+    with contextlib.redirect_stdout(io.StringIO()):
+        scene = Scene()
+
+    results = {}
+    for name, setup, params in CASES:
+        if filters and not any(f in name for f in filters):
+            continue
+        for p in param_grid(params, quick):
+            key = result_key(name, p)
+            results[key] = measure(lambda: setup(scene, **p), rounds)
+            print(f"{key:<48}{results[key]['median_ms']:10.3f} ms", flush=True)
+
+    return {
+        "meta": {
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "quick": quick,
+            "rounds": rounds,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=THRESHOLD):
+    """Print current vs baseline; returns the keys that got slower than the threshold."""
+    regressions = []
+    print(f"\n{'case':<48}{'baseline':>10}{'now':>10}{'change':>9}")
+    for key, result in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        change = result["median_ms"] / base["median_ms"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(key)
+            flag = "  SLOWER"
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{key:<48}{base['median_ms']:10.3f}{result['median_ms']:10.3f}{change:+8.0%}{flag}")
+    return regressions
+
+
+def save(data, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the game's hot paths and compare with a baseline.")
+    parser.add_argument("-k", dest="filters", action="append", default=[], help="only cases containing this")
+    parser.add_argument("--quick", action="store_true", help="skip the largest scenario sizes")
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    parser.add_argument("--out", default=LATEST, help="results JSON")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed slowdown, 0.15 = 15%%")
+    args = parser.parse_args()
+
+    data = run(args.filters, args.quick, args.rounds)
+    save(data, args.out)
+    print(f"results: {args.out}")
+
+    if args.save_baseline:
+        save(data, args.baseline)
+        print(f"baseline: {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"no baseline at {args.baseline} (run with --save-baseline)")
+        return 0
+
+    regressions = compare(data, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than {args.threshold:.0%}: " + ", ".join(regressions))
+        return 1
+    print(f"\nno regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
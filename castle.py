@@ -5,8 +5,13 @@ class CastleBox(pygame.sprite.Sprite):
     def __init__(self, pos, width, height, group, image):
         super().__init__(group)
 
-        self.image = pygame.transform.scale(image, (width, height))
-        self.rect = self.image.get_rect(topleft=(pos[0], pos[1] + height // 100))
+        if image is not None:
+            self.image = pygame.transform.scale(image, (width, height))
+            self.rect = self.image.get_rect(topleft=(pos[0], pos[1] + height // 100))
+        else:
+            # Headless castle: hitbox only
+            self.image = None
+            self.rect = pygame.Rect((pos[0], pos[1] + height // 100), (width, height))
 
         # HP defaults
         self.has_hp = False
@@ -20,13 +25,6 @@ class CastleBox(pygame.sprite.Sprite):
         self.hp = max(0, self.hp - amount)
         print("Castle HP:", self.hp)
 
-        # Automatically assign HUD castle
-        try:
-            from main import game
-            game.main_castle = self
-        except:
-            pass
-
     def draw_health(self, surface):
         if not self.has_hp:
             return
@@ -41,5 +39,6 @@ class CastleBox(pygame.sprite.Sprite):
 
         pygame.draw.rect(surface, (255, 0, 0), (x, y, fill, bar_height))
         pygame.draw.rect(surface, (255, 255, 255), (x, y, bar_width, bar_height), 2)
+        return pygame.Rect(x, y, bar_width, bar_height)
 
         
@@ -0,0 +1,85 @@
+"""
+Tower coverage along the monster path, for the wave AI.
+
+The path is sampled every SAMPLE_STEP px; each sample gets the DPS of every
+tower whose range reaches it (damage x fire_rate, the same numbers the
+towers shoot with). From that the AI reads:
+
+    gap_share    how much of the path is barely defended
+    burst_share  how much of the DPS comes in big single hits
+    exposure     DPS summed over the path (0 = no tower reaches it)
+
+update(towers) recomputes only when a tower was added, removed, moved or
+changed stats (upgrades, permanent upgrades); otherwise it costs one
+signature comparison.
+"""
+SAMPLE_STEP = 8        # px of path per sample
+CELL = 64              # px, sample buckets for the range lookups
+LOW_DPS_RATIO = 0.25   # a sample is a gap below this share of the mean DPS
+BURST_DAMAGE = 40      # a shot this big kills fast / flying / swarm outright
+
+
+class CoverageMap:
+    def __init__(self, path, step=SAMPLE_STEP):
+        self.path = path
+        self.step = step
+
+        count = max(1, int(path.length // step) + 1)
+        self.samples = [path.point_at(i * step) for i in range(count)]
+        self.buckets = {}
+        for i, (x, y) in enumerate(self.samples):
+            self.buckets.setdefault((int(x // CELL), int(y // CELL)), []).append(i)
+
+        self.signature = None
+        self.dps = [0.0] * count
+        self.burst_dps = [0.0] * count
+        self.exposure = 0.0     # sum of DPS x px of path: damage taken at 1 px/s
+        self.gap_share = 1.0
+        self.burst_share = 0.0
+        self.recomputes = 0
+
+    # -----------------------------
+    # Building
+    # -----------------------------
+    def update(self, towers):
+        """Recompute if the towers changed since last time. True if it did."""
+        signature = tuple((t.rect.center, t.range, t.damage, t.fire_rate) for t in towers)
+        if signature == self.signature:
+            return False
+        self.signature = signature
+        self.compute(signature)
+        return True
+
+    def compute(self, towers):
+        """towers: (center, range, damage, fire_rate) per tower."""
+        count = len(self.samples)
+        dps = [0.0] * count
+        burst_dps = [0.0] * count
+        samples = self.samples
+        buckets = self.buckets
+
+        for (cx, cy), radius, damage, fire_rate in towers:
+            tower_dps = damage * fire_rate
+            burst = damage >= BURST_DAMAGE
+            radius_sq = radius * radius
+            for gx in range(int((cx - radius) // CELL), int((cx + radius) // CELL) + 1):
+                for gy in range(int((cy - radius) // CELL), int((cy + radius) // CELL) + 1):
+                    for i in buckets.get((gx, gy), ()):
+                        x, y = samples[i]
+                        if (x - cx) ** 2 + (y - cy) ** 2 <= radius_sq:
+                            dps[i] += tower_dps
+                            if burst:
+                                burst_dps[i] += tower_dps
+
+        self.dps = dps
+        self.burst_dps = burst_dps
+        total = sum(dps)
+        self.exposure = total * self.step
+        mean = total / count
+        self.gap_share = sum(1 for d in dps if d <= mean * LOW_DPS_RATIO) / count
+        self.burst_share = sum(burst_dps) / total if total else 0.0
+        self.recomputes += 1
+
+    @property
+    def covered(self):
+        return self.exposure > 0
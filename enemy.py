@@ -1,114 +1,64 @@
+import time
+import logging
+
 import pygame
-from os.path import join
 
-# Initialize Pygame
-pygame.init()
+from asset_loader import LOADER, enemy_manifest
+from enemy_types import ENEMY_TEMPLATES
 
-# Must set display mode first for convert_alpha()
-pygame.display.set_mode((1, 1)) # minimal hidden window just for image loading
+log = logging.getLogger("assets")
 
 
-def load_animation(path, size=None):
-    frames = []
-    for i in range(10):  # supports frame_0.png to frame_9.png
-        file = join(path, f"frame_{i}.png")
-        try:
-            img = pygame.image.load(file).convert_alpha()
+def hit_flash_frames(frames):
+    """Red-tinted copy of each frame, shown while a monster is hit."""
+    flashed = []
+    for frame in frames:
+        flash = pygame.Surface(frame.get_size(), pygame.SRCALPHA)
+        flash.fill((255, 0, 0, 120))
+        temp = frame.copy()
+        temp.blit(flash, (0, 0))
+        flashed.append(temp)
+    return flashed
 
-            # SCALE IF NEEDED
-            if size:
-                img = pygame.transform.smoothscale(img, size)
 
-            frames.append(img)
-        except:
-            break
-    return frames if frames else [pygame.Surface((1,1))]  # fallback
 # -----------------------------
-# Load enemy images manually
+# ENEMY TYPES: stats from enemy_types.py, animations filled in by load_enemy
 # -----------------------------
-def anim_folder(enemy, direction):
-    return join("assets", "images", "enemies", enemy, direction)
-
-# Load animations
-GRUNT_UP    = load_animation(anim_folder("grunt", "up"))
-GRUNT_DOWN  = load_animation(anim_folder("grunt", "down"))
-GRUNT_LEFT  = load_animation(anim_folder("grunt", "left"))
-GRUNT_RIGHT = load_animation(anim_folder("grunt", "right"))
+ENEMY_TYPES = {
+    name: {**template._asdict(), "anim": None, "hit_anim": None}
+    for name, template in ENEMY_TEMPLATES.items()
+}
 
-FAST_UP     = load_animation(anim_folder("fast", "up"))
-FAST_DOWN   = load_animation(anim_folder("fast", "down"))
-FAST_LEFT   = load_animation(anim_folder("fast", "left"))
-FAST_RIGHT  = load_animation(anim_folder("fast", "right"))
+# -----------------------------
+# Animations, loaded the first time a wave uses the type
+# -----------------------------
+QUEUED = {}  # enemy type -> manifest, decoding but not converted yet
 
-TANK_UP     = load_animation(anim_folder("tank", "up"))
-TANK_DOWN   = load_animation(anim_folder("tank", "down"))
-TANK_LEFT   = load_animation(anim_folder("tank", "left"))
-TANK_RIGHT  = load_animation(anim_folder("tank", "right"))
 
-FLYING_UP     = load_animation(anim_folder("flying", "up"))
-FLYING_DOWN   = load_animation(anim_folder("flying", "down"))
-FLYING_LEFT   = load_animation(anim_folder("flying", "left"))
-FLYING_RIGHT  = load_animation(anim_folder("flying", "right"))
+def preload_enemies(enemy_types):
+    """Start decoding the frames of these types in the background (e.g. at wave start)."""
+    for enemy_type in set(enemy_types):
+        if ENEMY_TYPES[enemy_type]["anim"] is None and enemy_type not in QUEUED:
+            manifest = QUEUED[enemy_type] = enemy_manifest(enemy_type)
+            LOADER.submit(path for paths in manifest.values() for path in paths)
 
-SWARM_UP     = load_animation(anim_folder("swarm", "up"))
-SWARM_DOWN   = load_animation(anim_folder("swarm", "down"))
-SWARM_LEFT   = load_animation(anim_folder("swarm", "left"))
-SWARM_RIGHT  = load_animation(anim_folder("swarm", "right"))
 
-# -----------------------------
-# ENEMY TYPES with placeholder animations
-# -----------------------------
-ENEMY_TYPES = {
-    "grunt": {
-        "speed": 1.67,
-        "hp": 60,
-        "damage": 10,
-        "flying": False,
-        "size": (48, 48),   # ⬅ custom resize
-        "anim": None        # will be auto-filled below
-    },
-    "fast": {
-        "speed": 3.00,
-        "hp": 40,
-        "damage": 5,
-        "flying": False,
-        "size": (40, 40),
-        "anim": None
-    },
-    "tank": {
-        "speed": 1.00,
-        "hp": 300,
-        "damage": 30,
-        "flying": False,
-        "size": (90, 90),
-        "anim": None
-    },
-    "flying": {
-        "speed": 2.43,
-        "hp": 45,
-        "damage": 8,
-        "flying": True,
-        "size": (60, 60),
-        "anim": None
-    },
-    "swarm": {
-        "speed": 1.95,
-        "hp": 20,
-        "damage": 3,
-        "flying": False,
-        "size": (32, 32),
-        "anim": None
-    },
-}
+def load_enemy(enemy_type):
+    """ENEMY_TYPES entry with "anim" / "hit_anim" filled in (needs the display)."""
+    data = ENEMY_TYPES[enemy_type]
+    if data["anim"] is not None:
+        return data
 
-# Load enemy animations based on each enemy's size
-for enemy_name, data in ENEMY_TYPES.items():
-    size = data.get("size", None)
+    start = time.perf_counter()
+    preload_enemies([enemy_type])
+    size = data["size"]
 
-    data["anim"] = {
-        "up":    load_animation(anim_folder(enemy_name, "up"), size=size),
-        "down":  load_animation(anim_folder(enemy_name, "down"), size=size),
-        "left":  load_animation(anim_folder(enemy_name, "left"), size=size),
-        "right": load_animation(anim_folder(enemy_name, "right"), size=size)
-    }
+    data["anim"] = {}
+    for direction, paths in QUEUED.pop(enemy_type).items():
+        frames = [pygame.transform.smoothscale(LOADER.image(path), size) for path in paths]
+        data["anim"][direction] = frames or [pygame.Surface((1,1))]  # fallback
+    # Hit flash variants, same layout as "anim"
+    data["hit_anim"] = {direction: hit_flash_frames(frames) for direction, frames in data["anim"].items()}
 
+    log.debug("Loaded %s animations in %.0f ms", enemy_type, (time.perf_counter() - start) * 1000)
+    return data
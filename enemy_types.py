@@ -0,0 +1,30 @@
+"""
+Enemy stats, the one table everything reads: the wave AI (cost), the wave
+compiler, Monster / MonsterStore (speed, hp, damage, size) and enemy.py,
+which adds the animations on top.
+
+Templates are namedtuples, so nothing can change a type's stats at runtime.
+"""
+from collections import namedtuple
+
+EnemyTemplate = namedtuple("EnemyTemplate", "name cost speed hp damage flying size")
+
+# Tank hp is 250: enemy.py said 300, but the game always overwrote it with the
+# AI table's 250 right after spawning, so 250 is what was actually played.
+ENEMY_TEMPLATES = {
+    "grunt":  EnemyTemplate("grunt",  cost=5,  speed=1.67, hp=60,  damage=10, flying=False, size=(48, 48)),
+    "fast":   EnemyTemplate("fast",   cost=7,  speed=3.00, hp=40,  damage=5,  flying=False, size=(40, 40)),
+    "tank":   EnemyTemplate("tank",   cost=20, speed=1.00, hp=250, damage=30, flying=False, size=(90, 90)),
+    "flying": EnemyTemplate("flying", cost=10, speed=2.43, hp=45,  damage=8,  flying=True,  size=(60, 60)),
+    "swarm":  EnemyTemplate("swarm",  cost=3,  speed=1.95, hp=20,  damage=3,  flying=False, size=(32, 32)),
+}
+
+
+def enemy_template(enemy_type):
+    """
+    Template of a type name (unknown names spawn as grunts, like they always
+    did); a template is returned as it is.
+    """
+    if isinstance(enemy_type, EnemyTemplate):
+        return enemy_type
+    return ENEMY_TEMPLATES.get(enemy_type, ENEMY_TEMPLATES["grunt"])
@@ -1,14 +1,16 @@
 import time
 import random
+import logging
+from collections import Counter
 
-# Define enemy types with attributes
-ENEMY_TYPES = {
-    "grunt":   {"cost": 5,  "speed": 1.67,  "hp": 60},
-    "fast":    {"cost": 7,  "speed": 3.00, "hp": 40},
-    "tank":    {"cost": 20, "speed": 1.00,  "hp": 250},
-    "flying":  {"cost": 10, "speed": 2.43, "hp": 45, "flying": True},
-    "swarm":   {"cost": 3,  "speed": 1.95,  "hp": 20},
-}
+from enemy_types import ENEMY_TEMPLATES
+from wave_compiler import compile_wave
+
+# Counter picks are logged at DEBUG (--log-level DEBUG / LOG_LEVEL=DEBUG)
+log = logging.getLogger("wave_ai")
+
+# Enemy stats live in enemy_types.py (cost, speed, hp, ...), one template per type
+ENEMY_TYPES = ENEMY_TEMPLATES
 
 # Predefined wave patterns
 WAVE_PATTERNS = {
@@ -19,6 +21,18 @@ WAVE_PATTERNS = {
     "mixed":    ["grunt", "fast", "tank", "grunt", "flying"]
 }
 
+# Endless mode: each wave buys enemies (ENEMY_TYPES cost) with a budget
+# that grows every wave, and they come in bursts instead of one by one
+ENDLESS_BUDGET = 40      # points for wave 1 (~6 grunts)
+ENDLESS_GROWTH = 1.12    # x per wave: ~700 enemies by wave 50, ~12,000 by wave 75
+BURST_GAP = 1.5          # seconds between bursts
+BURST_SPREAD = 0.4       # a burst's enemies all spawn within this many seconds
+
+# Counter-strategy: extra units picked from where the towers are (coverage.py)
+ADAPT_SHARE = 0.25       # counter units cost this share of the wave
+BURST_SHARE = 0.5        # this much DPS from big hits: tanks soak them
+GAP_SHARE = 0.5          # this much of the path barely defended: fast units run it
+
 # AI STATES
 class EnemyAIState:
     EARLY_GAME = 0
@@ -27,12 +41,16 @@ class EnemyAIState:
 
 # Strategic AI for Tower Defense Enemy Waves
 class TowerDefenseEnemyAI:
-    def __init__(self):
+    def __init__(self, rng=None, clock=None):
         self.state = EnemyAIState.EARLY_GAME
         self.wave_number = 1
         self.last_wave_time = 0.0
         self.wave_cooldown = 6.0
-        random.seed()
+        # Per-game RNG and clock (seconds); Simulation hands in its own so runs replay exactly
+        self.rng = rng or random.Random()
+        self.clock = clock or time.time
+        # CoverageMap of the path; Simulation sets it, without one there is no adapting
+        self.coverage = None
 
     def update_state(self):
         # remove cooldown reset completely
@@ -48,76 +66,141 @@ class TowerDefenseEnemyAI:
 
     def pick_strategy(self):
         if self.state == EnemyAIState.EARLY_GAME:
-            return random.choice(["balanced", "swarm"])
+            return self.rng.choice(["balanced", "swarm"])
         elif self.state == EnemyAIState.MID_GAME:
-            return random.choice(["balanced", "fast_rush", "mixed"])
+            return self.rng.choice(["balanced", "fast_rush", "mixed"])
         else:
-            return random.choice(["tank_push", "mixed", "swarm"])
+            return self.rng.choice(["tank_push", "mixed", "swarm"])
 
     def pick_monsters(self, strategy):
         pattern = WAVE_PATTERNS.get(strategy, ["grunt"])
         mutated = []
         for monster in pattern:
-            if random.random() < 0.12:
-                mutated.append(random.choice(list(ENEMY_TYPES.keys())))
+            if self.rng.random() < 0.12:
+                mutated.append(self.rng.choice(list(ENEMY_TYPES.keys())))
             else:
                 mutated.append(monster)
         return mutated
 
-    def maybe_adapt(self, towers):
-        if random.random() >= 0.20:
+    def counter_type(self):
+        """Enemy type that answers the current towers best, None without coverage."""
+        coverage = self.coverage
+        if coverage is None or not coverage.covered:
             return None
-        if any(getattr(t, "type", "") == "anti_ground_only" for t in towers):
-            return ["flying", "flying"]
-        if any(getattr(t, "type", "") == "slow_shooter" for t in towers):
-            return ["fast", "fast", "fast"]
-        if any(getattr(t, "type", "") == "short_range" for t in towers):
-            return ["tank"]
-        return None
+        if coverage.burst_share >= BURST_SHARE:
+            return "tank"
+        if coverage.gap_share >= GAP_SHARE:
+            return "fast"
+        # Even, sustained coverage: single-target towers drown in numbers
+        return "swarm"
+
+    def adapt(self, towers, wave):
+        """Counter units to add to this wave (coverage is only rebuilt when towers changed)."""
+        if self.coverage is None:
+            return None
+        self.coverage.update(towers)
+        counter = self.counter_type()
+        if counter is None:
+            return None
+        budget = ADAPT_SHARE * sum(ENEMY_TYPES[monster].cost for monster in wave)
+        count = max(1, round(budget / ENEMY_TYPES[counter].cost))
+        log.debug("counter +%d %s (gaps %.0f%%, burst %.0f%%)", count, counter,
+                  self.coverage.gap_share * 100, self.coverage.burst_share * 100)
+        return [counter] * count
 
     def can_spawn_wave_now(self):
         return True
 
+    def spawn_times(self, wave):
+        """Spawn time of each enemy after wave start; None = one per spawn interval."""
+        return None
+
     def generate_wave(self, towers, force=False):
         self.update_state()
 
         if not force:
-            now = time.time()
+            now = self.clock()
             if now - self.last_wave_time < self.wave_cooldown:
                 return None
 
         strategy = self.pick_strategy()
         wave = self.pick_monsters(strategy)
 
-        adapt = self.maybe_adapt(towers)
+        adapt = self.adapt(towers, wave)
         if adapt:
             wave.extend(adapt)
 
         self.wave_number += 1
-        self.last_wave_time = time.time()
+        self.last_wave_time = self.clock()
+        return wave
+
+
+def wave_budget(wave_number):
+    """Endless-mode points for a wave: ENDLESS_BUDGET, x ENDLESS_GROWTH per wave after the first."""
+    return int(ENDLESS_BUDGET * ENDLESS_GROWTH ** (wave_number - 1))
+
+
+# Endless waves: same states and strategies, but sized by budget
+class EndlessEnemyAI(TowerDefenseEnemyAI):
+    def pick_monsters(self, strategy):
+        """Spend this wave's budget, mixing types like the strategy's pattern does."""
+        pattern = WAVE_PATTERNS.get(strategy, ["grunt"])
+        names = list(ENEMY_TYPES.keys())
+        cheapest = min(names, key=lambda name: ENEMY_TYPES[name].cost)
+
+        budget = wave_budget(self.wave_number)
+        wave = []
+        while budget >= ENEMY_TYPES[cheapest].cost:
+            if self.rng.random() < 0.12:
+                monster = self.rng.choice(names)
+            else:
+                monster = self.rng.choice(pattern)
+            if ENEMY_TYPES[monster].cost > budget:
+                monster = cheapest
+            budget -= ENEMY_TYPES[monster].cost
+            wave.append(monster)
         return wave
 
+    def spawn_times(self, wave):
+        # Bursts of ~sqrt(n) enemies: a few at a time early on, crowds later
+        size = max(1, int(len(wave) ** 0.5))
+        return [(i // size + 1) * BURST_GAP + self.rng.random() * BURST_SPREAD for i in range(len(wave))]
+
+
 # Wave Director to manage spawning
 class WaveDirector:
-    def __init__(self, spawn_callback):
+    def __init__(self, spawn_callback, prepare_callback=None, rng=None, clock=None, endless=False):
         self.spawn_callback = spawn_callback
+        self.prepare_callback = prepare_callback  # gets each new wave's enemy list before spawning
 
-        self.ai = TowerDefenseEnemyAI()
-        self.current_wave = []
+        self.ai = (EndlessEnemyAI if endless else TowerDefenseEnemyAI)(rng, clock)
+        self.current_wave = []   # enemy names of the running wave
+        self.schedule = None     # its compiled SpawnSchedule
+        self.wave_time = 0.0     # seconds since the wave started
         self.enemies_spawned = 0
 
-        self.spawn_timer = 0
         self.spawn_interval = 800  # ms per enemy
 
         self.force_next_wave = False
 
+    def reset(self):
+        self.ai.wave_number = 1
+        self.ai.last_wave_time = 0
+        self.current_wave = []
+        self.schedule = None
+        self.enemies_spawned = 0
+
     def start_wave(self, towers, force=False):
         wave = self.ai.generate_wave(towers, force=force)
         if wave:
-            print(f"🔥 Starting Wave {self.ai.wave_number - 1} - {wave}")
+            # Endless waves get big: counts per type instead of the whole list
+            print(f"🔥 Starting Wave {self.ai.wave_number - 1} - {wave if len(wave) <= 20 else dict(Counter(wave))}")
+            if self.prepare_callback:
+                self.prepare_callback(wave)
             self.current_wave = wave
+            self.schedule = compile_wave(wave, self.spawn_interval / 1000.0, self.ai.spawn_times(wave))
+            self.wave_time = 0.0
             self.enemies_spawned = 0
-            self.spawn_timer = 0
 
     def update(self, dt, towers):
         if not self.current_wave:
@@ -131,15 +214,14 @@ class WaveDirector:
                 self.start_wave(towers, force=False)
             return
 
-        self.spawn_timer += dt
-        if self.spawn_timer >= self.spawn_interval / 1000.0:
-            enemy_type = self.current_wave[self.enemies_spawned]
-            self.spawn_callback(enemy_type)
+        # Everything due this tick spawns now, however many that is
+        self.wave_time += dt
+        for template in self.schedule.pop_due(self.wave_time):
+            self.spawn_callback(template)
             self.enemies_spawned += 1
-            self.spawn_timer = 0
 
         # If finished spawning all enemies, clear current_wave so next can start
-        if self.enemies_spawned >= len(self.current_wave):
+        if self.schedule.done:
             self.current_wave = []
+            self.schedule = None
             self.enemies_spawned = 0
-            self.spawn_timer = 0
@@ -0,0 +1,120 @@
+"""
+Economy ledger: every money movement as a small typed event, kept in memory
+instead of printed.
+
+    ledger.record(KILL_REWARD, +25, balance)
+
+Recent events live in a ring buffer, totals per wave are kept up to date for
+the HUD, and with a path set, events are appended to a JSONL file in batches
+(on a worker thread with background=True). Without a path nothing is queued.
+"""
+import json
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Event kinds
+KILL_REWARD = "kill_reward"
+WAVE_START_BONUS = "wave_start_bonus"
+WAVE_COMPLETE_BONUS = "wave_complete_bonus"
+CASTLE_DEFENSE_BONUS = "castle_defense_bonus"
+TOWER_PLACED = "tower_placed"
+TOWER_UPGRADED = "tower_upgraded"
+OTHER = "other"
+
+
+class WaveTotals:
+    __slots__ = ("earned", "spent", "kills", "towers", "upgrades")
+
+    def __init__(self):
+        self.earned = 0
+        self.spent = 0
+        self.kills = 0
+        self.towers = 0
+        self.upgrades = 0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class EconomyLedger:
+    def __init__(self, capacity=4096, path=None, flush_every=256, background=False):
+        self.events = deque(maxlen=capacity)  # (tick, wave, kind, amount, balance), newest last
+        self.waves = {}                       # wave -> WaveTotals
+        self.totals = WaveTotals()            # whole game
+
+        # Stamped on every event; Simulation keeps these current
+        self.tick = 0
+        self.wave = 0
+
+        self.path = path
+        self.flush_every = flush_every
+        self.pending = []
+        # No path, no file writes: no worker thread either
+        self.pool = ThreadPoolExecutor(1, thread_name_prefix="ledger") if background and path is not None else None
+        self.writes = []  # running background flushes
+
+    def record(self, kind, amount, balance):
+        """amount: + earned, - spent."""
+        event = (self.tick, self.wave, kind, amount, balance)
+        self.events.append(event)
+
+        totals = self.waves.get(self.wave)
+        if totals is None:
+            totals = self.waves[self.wave] = WaveTotals()
+        for t in (totals, self.totals):
+            if amount >= 0:
+                t.earned += amount
+            else:
+                t.spent -= amount
+            if kind == KILL_REWARD:
+                t.kills += 1
+            elif kind == TOWER_PLACED:
+                t.towers += 1
+            elif kind == TOWER_UPGRADED:
+                t.upgrades += 1
+
+        if self.path is not None:
+            self.pending.append(event)
+            if len(self.pending) >= self.flush_every:
+                self.flush()
+
+    def wave_totals(self, wave=None):
+        """Totals for one wave (the current one by default)."""
+        return self.waves.get(self.wave if wave is None else wave) or WaveTotals()
+
+    def recent(self, count=10):
+        return list(self.events)[-count:]
+
+    # -----------------------------
+    # File
+    # -----------------------------
+    def flush(self):
+        if not self.pending or self.path is None:
+            return
+        batch, self.pending = self.pending, []
+        if self.pool is None:
+            self._write(batch)
+        else:
+            # One worker: batches land in the file in order
+            self.writes = [w for w in self.writes if not w.done()]
+            self.writes.append(self.pool.submit(self._write, batch))
+
+    def _write(self, batch):
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        lines = [json.dumps({"tick": tick, "wave": wave, "kind": kind, "amount": amount, "balance": balance})
+                 for tick, wave, kind, amount, balance in batch]
+        with open(self.path, "a") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def close(self):
+        """Write whatever is left and wait for background writes."""
+        self.flush()
+        for write in self.writes:
+            write.result()
+        self.writes = []
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
@@ -1,23 +1,47 @@
 import os
+import time
+STARTUP = time.perf_counter()  # for the startup report
+import logging
 # Must be set BEFORE pygame.init()
 os.environ["SDL_VIDEO_CENTERED"] = "1"
 os.environ["SDL_VIDEO_WINDOW_POS"] = "center"
 import random
 from settings import *
 from sprites import *
-from monsters import Monster
-from castle import CastleBox
 from user_interface import UserInterface, Dropdown
 from slider import Slider
 from tower import Tower # import Tower class
-from game_ai import ENEMY_TYPES, WaveDirector
-
-from pytmx.util_pygame import load_pygame
+from game_ai import WaveDirector
+from simulation import Simulation, MAP_PATH
+from map_bundle import load_map_bundle
+from placement import PlacementGrid
+from replay import LAST_REPLAY
+from store import JsonStore
+from profiler import PROFILER
 
 from money import MoneySystem 
+from ledger import EconomyLedger
+from asset_cache import ASSETS
+from projectile import PROJECTILE_POOLS
+from renderer import DirtyRectRenderer
+from text_cache import TEXT
+from asset_loader import LOADER, LoadTimer, UI_IMAGES
+from atlas import load_atlas
+from enemy import preload_enemies
 import pygame
 import json
 
+log = logging.getLogger("game")
+
+ECONOMY_LOG = join("logs", "economy.jsonl")
+# Shipped defaults; the player's copies are saved by store.JsonStore outside assets/
+SETTINGS_DEFAULTS = join("assets", "data", "settings.json")
+UPGRADES_DEFAULTS = join("assets", "data", "upgrades", "permanent_upgrades.json")
+RENDER_RATES = (30, 60, 144, 0)  # F6 cycles the frame cap, 0 = uncapped
+MAX_FRAME_TIME = 0.25            # longer frames (window dragged, breakpoint) are not caught up
+TIME_SCALES = (1, 2, 4, 0)       # F / speed button cycles the game speed, 0 = max
+MAX_SPEED_BUDGET = 0.1           # "max": simulate this long (s), then draw one frame
+
 class TowerDefense:
     """
     Main Tower Defense game class.
@@ -25,11 +49,18 @@ class TowerDefense:
     """
 
     def __init__(self):
+        timer = LoadTimer(STARTUP)
+        timer.lap("imports")
+        # Packed sheets from `python atlas.py`, if built
+        LOADER.use_atlas(load_atlas())
+        # Start decoding UI images right away, they're converted when the display is up
+        LOADER.submit(path for group in UI_IMAGES.values() for path in group.values())
+
         pygame.init()
         self.main_castle = None
-        self.wave_director = WaveDirector(self.spawn_enemy)
-        self.load_display_settings()
-        self.settings = self.load_display_settings()
+        self.wave_director = WaveDirector(self.spawn_enemy, prepare_callback=preload_enemies)
+        # Read once; saves go to the user data folder in the background
+        self.settings = JsonStore("settings.json", SETTINGS_DEFAULTS, defaults={"resolution": "1280x720"})
         self.GAME_WIDTH  = 1280
         self.GAME_HEIGHT = 720
         self.fullscreen = False
@@ -40,8 +71,16 @@ class TowerDefense:
             self.screen = pygame.display.set_mode((self.GAME_WIDTH, self.GAME_HEIGHT))
 
         self.game_surface = pygame.Surface((self.GAME_WIDTH, self.GAME_HEIGHT))
+        # F2 / "renderer" in settings.json: "dirty" (default) or "full"
+        self.renderer = DirtyRectRenderer(self.GAME_WIDTH, self.GAME_HEIGHT,
+                                          enabled=self.settings.get("renderer", "dirty") == "dirty")
+        # F6 / "fps" in settings.json: frames drawn per second. The game itself
+        # always runs at the simulation's TICK_RATE, whatever this is.
+        self.fps = self.settings.get("fps", 60)
+        self.accumulator = 0.0  # frame time not yet simulated
+        self.time_scale = 1     # simulated seconds per real second, 0 = as fast as possible
+        self.speed_button = pygame.Rect(self.GAME_WIDTH - 110, self.GAME_HEIGHT - 125 - 36, 90, 28)
 
-        self.settings = self.load_display_settings()
         self.current_resolution = self.settings["resolution"]
 
         self.apply_saved_resolution()
@@ -53,6 +92,7 @@ class TowerDefense:
         mouse_cursor_img = pygame.transform.scale(mouse_cursor_img, (40, 32))  # Scale to cursor size
         mouse_cursor = pygame.cursors.Cursor((0, 0), mouse_cursor_img)
         pygame.mouse.set_cursor(mouse_cursor)
+        timer.lap("display")
         
         # Wave director
 
@@ -77,6 +117,7 @@ class TowerDefense:
         self.show_map = False
         
         self.inGame = False
+        self.show_debug = False  # F3: pool / cache counters
 
         # Sounds
         self.button_sfx = pygame.mixer.Sound(join('assets', 'audio', 'sfx', 'button-click.wav'))
@@ -84,35 +125,17 @@ class TowerDefense:
         self.game_bgmusic = pygame.mixer.Sound(join('assets', 'audio', 'bgm', 'game_bgm.wav'))
         self.hover_sfx = pygame.mixer.Sound(join('assets', 'audio', 'sfx', 'mouse-hover.wav'))
 
-        # Load UI images
-        self.startscreen_images = {
-            "start": pygame.image.load(join('assets', 'images', 'startscreen', 'Startscreen.png')).convert_alpha(),
-            "logo": pygame.image.load(join('assets', 'images', 'startscreen', 'logo.png')).convert_alpha(),
-            "play": pygame.image.load(join('assets', 'images', 'startscreen', 'play.png')).convert_alpha(),
-            "setting": pygame.image.load(join('assets', 'images', 'startscreen', 'settings.png')).convert_alpha(),
-            "exit": pygame.image.load(join('assets', 'images', 'startscreen', 'exit.png')).convert_alpha(),}
-        self.map_selection_images = {
-            "map": pygame.image.load(join('assets', 'images', 'mapscreen', 'map.png')).convert_alpha(),
-            "back": pygame.image.load(join('assets', 'images', 'mapscreen', 'back.png')).convert_alpha(),
-            "upgrade": pygame.image.load(join('assets', 'images', 'mapscreen', 'upgrade.png')).convert_alpha()}
-        self.upgrades_images = {"border": pygame.image.load(join('assets', 'images', 'mapscreen', 'border.png')).convert_alpha(),
-                                "archer": pygame.image.load(join('assets', 'images', 'mapscreen', 'upgrades', 'archer.png')).convert_alpha(),
-                                "stone": pygame.image.load(join('assets', 'images', 'mapscreen', 'upgrades', 'stone.png')).convert_alpha(),
-                                "slingshot": pygame.image.load(join('assets', 'images', 'mapscreen', 'upgrades', 'slingshot.png')).convert_alpha(),
-                                "bomb": pygame.image.load(join('assets', 'images', 'mapscreen', 'upgrades', 'bomb.png')).convert_alpha()}
-        self.map_images = {"map1": pygame.image.load(join('assets', 'images', 'mapscreen', 'map1.png')).convert_alpha(),
-                            "map2": pygame.image.load(join('assets', 'images', 'mapscreen', 'map2.png')).convert_alpha()}
-        self.settings_images = {"display": pygame.image.load(join('assets', 'images', 'startscreen','settings', 'display.png')).convert_alpha(),
-                                "music": pygame.image.load(join('assets', 'images', 'startscreen','settings', 'music.png')).convert_alpha(),
-                                "sfx": pygame.image.load(join('assets', 'images', 'startscreen','settings', 'sfx.png')).convert_alpha()
-                                }
-        self.slider_images = {"handle": pygame.image.load(join('assets', 'images', 'slider','slider_handle.png')).convert_alpha(),
-                                "bar": pygame.image.load(join('assets', 'images', 'slider','slider_bar.png')).convert_alpha()}
-        self.drop_down_images = {"fullscreen": pygame.image.load(join('assets', 'images', 'startscreen', 'settings', 'fullscreen.png')).convert_alpha(),
-                                "1280": pygame.image.load(join('assets', 'images', 'startscreen', 'settings', '1280x720.png')).convert_alpha(),
-                                "1600": pygame.image.load(join('assets', 'images', 'startscreen', 'settings', '1600x900.png')).convert_alpha(),
-                                "arrow": pygame.image.load(join('assets', 'images', 'startscreen', 'settings', 'arrow.png')).convert_alpha()}
+        timer.lap("sounds")
 
+        # Load UI images
+        self.startscreen_images = self.load_ui_images("startscreen")
+        self.map_selection_images = self.load_ui_images("map_selection")
+        self.upgrades_images = self.load_ui_images("upgrades")
+        self.map_images = self.load_ui_images("maps")
+        self.settings_images = self.load_ui_images("settings")
+        self.slider_images = self.load_ui_images("slider")
+        self.drop_down_images = self.load_ui_images("drop_down")
+        timer.lap("ui images")
 
         # -------------------
         # Tower images
@@ -128,22 +151,29 @@ class TowerDefense:
         self.countdown_active = False
         self.wave_timer = None
         self.countdown = 0  
-        #Money
-        self.money_system = MoneySystem(starting_money=500)
+        #Money ("economy_log": true in settings.json also writes every transaction to logs/)
+        ledger = EconomyLedger(path=ECONOMY_LOG if self.settings.get("economy_log") else None, background=True)
+        self.money_system = MoneySystem(starting_money=500, ledger=ledger)
 
         # load tower stats and upgrades
         self.load_towers_from_json()
         self.load_permanent_upgrades()
+        timer.lap("towers")
 
         self.start_screen()  # make sure setup is called after
         self.start_bgmusic.play(loops=-1)
+        timer.lap("start screen")
+        print(timer.report())
         # Setup game map, sprites, castles, monsters
 
     # ----------------------------------------------
     # SAVE AND LOAD FUNCTIONS
     # ----------------------------------------------
     def load_image(self, path):
-        return pygame.image.load(path).convert_alpha()
+        return ASSETS.image(path)
+
+    def load_ui_images(self, group):
+        return {name: LOADER.image(path) for name, path in UI_IMAGES[group].items()}
 
     def load_towers_from_json(self):
         json_path = "assets/data/upgrades/towers.json"
@@ -189,56 +219,34 @@ class TowerDefense:
                 "projectile_image": projectile,
                 "projectile_speed": tdata["projectile_speed"],
                 "size": tuple(tdata["size"]),
-                "sound": tdata.get("sound")  # ✅ add sound path from JSON
+                "sound": tdata.get("sound"),  # ✅ add sound path from JSON
+                "targeting": tdata.get("targeting", "nearest")
             })
 
             slot_index += 1
 
     def load_permanent_upgrades(self):
-        path = "assets/data/upgrades/permanent_upgrades.json"
-        try:
-            with open(path, "r") as f:
-                self.permanent_upgrades = json.load(f)
-        except FileNotFoundError:
+        self.upgrade_store = JsonStore("permanent_upgrades.json", UPGRADES_DEFAULTS)
+        if not self.upgrade_store.data:
             print("WARNING: permanent_upgrades.json not found!")
-            self.permanent_upgrades = {}
+        # Same dict as the store's: the upgrade cards change it in place
+        self.permanent_upgrades = self.upgrade_store.data
 
     def save_permanent_upgrades(self):
-        path = "assets/data/upgrades/permanent_upgrades.json"
-        with open(path, "w") as f:
-            json.dump(self.permanent_upgrades, f, indent=4)
-        print("Permanent upgrades saved!")
+        self.upgrade_store.save()
 
     def save_settings(self):
-        data = {
+        self.settings.update({
             "music": self.slider_music.get_value(),
             "sfx": self.slider_sfx.get_value(),
-            "resolution": self.current_resolution
-        }
-        with open("assets/data/settings.json", "w") as f:
-            json.dump(data, f, indent=4)
-
-    def load_display_settings(self):
-        try:
-            with open("assets/data/settings.json", "r") as f:
-                data = json.load(f)
-                return data
-        except:
-            return {"resolution": "1280x720"}
+            "resolution": self.current_resolution,
+            "renderer": "dirty" if self.renderer.enabled else "full",
+            "fps": self.fps,
+            "economy_log": self.money_system.ledger.path is not None
+        })
 
     def load_audio_settings(self):
-        try:
-            with open("assets/data/settings.json", "r") as f:
-                data = json.load(f)
-        except FileNotFoundError:
-            # File missing → create defaults
-            data = {
-                "music": 50,
-                "sfx": 50,
-                "resolution": "1280x720"
-            }
-            with open("settings.json", "w") as f:
-                json.dump(data, f, indent=4)
+        data = self.settings
 
         # Apply to sliders if they exist
         if hasattr(self, "slider_music") and self.slider_music:
@@ -301,7 +309,6 @@ class TowerDefense:
         self.slider_music = Slider("slider_music", (-self.GAME_WIDTH // 2 + 300, 470), bar_surface=self.slider_images["bar"], bar_scale=(600, 40), handle_surface=self.slider_images["handle"], handle_scale=(45, 45), ui_group=self.ui_sprites, min_value=0, max_value=100, default_value=50, game_width=self.GAME_WIDTH, game_height=self.GAME_HEIGHT, hover_sfx=self.hover_sfx)
         self.slider_sfx = Slider("slider_sfx", (-self.GAME_WIDTH // 2 + 300, 570), bar_surface=self.slider_images["bar"], bar_scale=(600, 40), handle_surface=self.slider_images["handle"], handle_scale=(45, 45), ui_group=self.ui_sprites, min_value=0, max_value=100, default_value=50, game_width=self.GAME_WIDTH, game_height=self.GAME_HEIGHT, hover_sfx=self.hover_sfx)
 
-        self.settings = self.load_display_settings()
         self.current_resolution = self.settings["resolution"]
 
         self.res_image_map = {
@@ -359,71 +366,49 @@ class TowerDefense:
     # -----------------------------------------------
     def setup(self):
         # reset wave director every game
-        self.wave_director.ai.wave_number = 1
-        self.wave_director.ai.last_wave_time = 0
-        self.wave_director.current_wave = []
-        self.wave_director.enemies_spawned = 0
+        self.wave_director.reset()
 
         self.inGame = True
-        self.grass_tiles = []  # initialize here
-        tmx_data = load_pygame(join('assets', 'data', 'tmx', 'finals.tmx'))
-
-        # Ground tiles
-        ground_layer = tmx_data.get_layer_by_name("Ground")
-        for x, y, image in ground_layer.tiles():
-            Sprites((x * TILE_SIZE, y * TILE_SIZE), image, self.all_sprites)
-            
-            tile_gid = ground_layer.data[y][x]  # get the GID for this tile
-            tile_rect = pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-            self.grass_tiles.append({"rect": tile_rect, "id": tile_gid})
-
-        # Castles
-        self.castles = pygame.sprite.Group()
-        castle_layer = tmx_data.get_layer_by_name("castle")
-        for obj in castle_layer:
-            if hasattr(obj, "image") and obj.image is not None:
-                castle = CastleBox((obj.x, obj.y), obj.width, obj.height, self.all_sprites, image=obj.image)
-                self.all_sprites.add(castle)
-                self.castles.add(castle)
-                if obj.properties.get("hp_castle", False):
-                    castle.has_hp = True
-
-        # Other layers
-        for layer_name in ["House", "decoration", "fences"]:
-            for obj in tmx_data.get_layer_by_name(layer_name):
-                Objects((obj.x, obj.y), obj.image, (obj.width, obj.height), obj.rotation, self.all_sprites)
+        # Compiled once per TMX edit (assets/cache/maps), not parsed on every game start
+        game_map = load_map_bundle(MAP_PATH, background_size=(self.GAME_WIDTH, self.GAME_HEIGHT))
 
-        # Waypoints
-        self.waypoints = [(waypoint.x, waypoint.y) for waypoint in tmx_data.get_layer_by_name("Waypoints1")]
+        # Buildable (grass) tiles + towers already standing
+        self.placement = PlacementGrid(game_map.ground)
+        for tower in self.placed_towers:
+            self.placement.add(tower)
 
-        # Clear and repopulate monster group
+        # Castles (their images are part of the background)
+        self.castles = game_map.build_castles()
 
-        self.path_rects = [pygame.Rect(x, y, TILE_SIZE, TILE_SIZE) for x, y in self.waypoints]
+        # Ground, castles, houses, decoration and fences are baked into one background;
+        # all_sprites only holds what moves: monsters, towers, projectiles
+        self.all_sprites.set_background(game_map.background)
 
-    def spawn_enemy(self, enemy_type):
-        """Spawns a monster based on its type with correct sprite and stats."""
+        # Waypoints
+        self.waypoints = game_map.waypoints["Waypoints1"]
 
-        # Get stats for this enemy type
-        stats = ENEMY_TYPES.get(enemy_type, ENEMY_TYPES["grunt"])
+        self.path_rects = [pygame.Rect(x, y, TILE_SIZE, TILE_SIZE) for x, y in self.waypoints]
 
-        # Create the Monster (animations & speed are handled inside)
-        monster = Monster(
-            enemy_type=enemy_type,
-            waypoints=self.waypoints,
-            group=self.all_sprites,
-            money_system=self.money_system  # <-- pass money system here
+        # Game logic (monsters, towers, waves, castle hits) lives in the simulation
+        self.simulation = Simulation(
+            self.waypoints,
+            self.castles,
+            money_system=self.money_system,
+            wave_director=self.wave_director,
+            world=self.all_sprites,
+            towers=self.placed_towers,
+            headless=False,
+            interpolate=True
         )
+        self.simulation.replay.map_path = MAP_PATH
+        self.accumulator = 0.0
+        self.time_scale = 1
+        self.monsters = self.simulation.monsters
+        self.main_castle = self.simulation.main_castle
 
-        # Assign extra attributes
-        monster.hp = stats["hp"]
-        monster.max_hp = stats["hp"]
-        monster.flying = stats.get("flying", False)
-        monster.type = enemy_type
-
-        # Add to monster group
-        self.monsters.add(monster)
-
-        
+    def spawn_enemy(self, enemy_type):
+        """Spawns a monster of an EnemyTemplate (or type name) with its sprite and stats."""
+        self.simulation.spawn_enemy(enemy_type)
 
     def can_place_tower(self, pos, tower_size=(64,64)):
         px, py = pos
@@ -431,34 +416,8 @@ class TowerDefense:
 
         tower_rect = pygame.Rect(px - w//2, py - h, w, h)   # bottom-center placement
 
-        # Check if all corners are on valid grass tiles
-        corners = [
-            (tower_rect.left, tower_rect.top),
-            (tower_rect.right, tower_rect.top),
-            (tower_rect.left, tower_rect.bottom),
-            (tower_rect.right, tower_rect.bottom),
-            (tower_rect.centerx, tower_rect.bottom),
-        ]
-
-        valid_tile = False
-        for tile in self.grass_tiles:
-            if tile["id"] == 1:  # grass tile
-                for c in corners:
-                    if tile["rect"].collidepoint(c):
-                        valid_tile = True
-                        break
-            if valid_tile:
-                break
-
-        if not valid_tile:
-            return False
-
-        # Check tower overlap
-        for t in self.placed_towers:
-            if tower_rect.colliderect(t.rect):
-                return False
-
-        return True
+        # A corner on grass and no overlap with placed towers (tile lookups, see placement.py)
+        return self.placement.can_place(tower_rect)
 
     def draw_tower_ui(self, surface):
         """
@@ -476,6 +435,7 @@ class TowerDefense:
                     pygame.draw.circle(overlay, (0, 255, 0, 80), (tower.range, tower.range), tower.range)
                     pygame.draw.circle(overlay, (0, 255, 0), (tower.range, tower.range), tower.range, 2)
                     surface.blit(overlay, (tower.rect.centerx - tower.range, tower.rect.centery - tower.range))
+                    self.renderer.mark(overlay.get_rect(center=tower.rect.center))
 
                 # Medieval Colors
                 BROWN = (139, 69, 19)
@@ -483,8 +443,6 @@ class TowerDefense:
                 TEXT_COLOR = (240, 220, 180)
                 GOLD = (212, 175, 55)
 
-                font = pygame.font.Font("assets/Monocraft.ttc", 12)   
-
                 # Always draw delete button
                 tower.delete_button = pygame.Rect(tower.rect.right + 10, tower.rect.top, 80, 32)
 
@@ -492,7 +450,7 @@ class TowerDefense:
                 pygame.draw.rect(surface, BROWN, tower.delete_button, border_radius=6)
                 pygame.draw.rect(surface, DARK_BROWN, tower.delete_button, 2, border_radius=6)
 
-                delete_text = font.render("DELETE", True, TEXT_COLOR)
+                delete_text = TEXT.render("DELETE", 12, TEXT_COLOR)
                 surface.blit(delete_text, (
                     tower.delete_button.centerx - delete_text.get_width() // 2,
                     tower.delete_button.centery - delete_text.get_height() // 2
@@ -506,7 +464,7 @@ class TowerDefense:
                     pygame.draw.rect(surface, BROWN, tower.upgrade_button, border_radius=6)
                     pygame.draw.rect(surface, DARK_BROWN, tower.upgrade_button, 2, border_radius=6)
 
-                    upgrade_text = font.render("UPGRADE", True, TEXT_COLOR)
+                    upgrade_text = TEXT.render("UPGRADE", 12, TEXT_COLOR)
                     surface.blit(upgrade_text, (
                         tower.upgrade_button.centerx - upgrade_text.get_width() // 2,
                         tower.upgrade_button.centery - upgrade_text.get_height() // 2
@@ -525,7 +483,7 @@ class TowerDefense:
                     pygame.draw.rect(surface, DARK_BROWN, max_rect, 2, border_radius=6)
 
                     # Draw MAX text
-                    max_text = font.render("MAX", True, GOLD)
+                    max_text = TEXT.render("MAX", 12, GOLD)
                     surface.blit(max_text, (
                         max_rect.centerx - max_text.get_width() // 2,
                         max_rect.centery - max_text.get_height() // 2
@@ -541,17 +499,39 @@ class TowerDefense:
                 pygame.draw.rect(surface, GOLD, banner, border_radius=4)
                 pygame.draw.rect(surface, DARK_BROWN, banner, 2, border_radius=4)
 
-                level_text = font.render(f"Lvl {tower.level}", True, (50, 30, 10))
+                level_text = TEXT.render(f"Lvl {tower.level}", 12, (50, 30, 10))
                 surface.blit(level_text, (
                     banner.centerx - level_text.get_width() // 2,
                     banner.centery - level_text.get_height() // 2
                 ))
 
+                # buttons + banner column
+                self.renderer.mark(tower.delete_button.union(banner))
+
             else:
                 tower.delete_button = None
                 tower.upgrade_button = None
 
 
+    def cycle_time_scale(self):
+        i = TIME_SCALES.index(self.time_scale)
+        self.time_scale = TIME_SCALES[(i + 1) % len(TIME_SCALES)]
+        self.accumulator = 0.0
+        print(f"Game speed: {self.time_scale_label()}")
+
+    def time_scale_label(self):
+        return f"{self.time_scale}x" if self.time_scale else "MAX"
+
+    def draw_speed_button(self, surface, mouse):
+        """Game speed button above the right HUD (same as the F key)."""
+        hover = self.speed_button.collidepoint(mouse)
+        pygame.draw.rect(surface, (90, 70, 55) if hover else (60, 40, 30), self.speed_button, border_radius=8)
+        pygame.draw.rect(surface, (100, 80, 60), self.speed_button, 2, border_radius=8)
+        label = TEXT.render(f"SPEED {self.time_scale_label()}", 12,
+                            (255, 255, 255) if self.time_scale == 1 else (255, 220, 0))
+        surface.blit(label, label.get_rect(center=self.speed_button.center))
+        self.renderer.mark_static("speed", self.speed_button, (self.time_scale, hover))
+
     def draw_right_hud(self, surface):
         # Right panel matches height of left panel
         panel_h = 125
@@ -564,16 +544,13 @@ class TowerDefense:
         pygame.draw.rect(surface, (100,80,60),
                         (panel_x, panel_y, panel_w, panel_h), 2, border_radius=12)
 
-        small = pygame.font.Font("assets/Monocraft.ttc", 12)
-        title_f = pygame.font.Font("assets/Monocraft.ttc", 14)
-
         xpos = panel_x + 15
         ypos = panel_y + 5
 
         # =====================
         # CASTLE HP
         # =====================
-        surface.blit(title_f.render("CASTLE Health", True, (255,255,255)), (xpos, ypos))
+        surface.blit(TEXT.render("CASTLE Health", 14, (255,255,255)), (xpos, ypos))
         ypos += 25
 
         # load hp
@@ -592,7 +569,7 @@ class TowerDefense:
         pygame.draw.rect(surface, (50,200,60), (xpos, ypos, fill, bar_h), border_radius=4)
 
         # hp text
-        surface.blit(small.render(f"{hp}/{max_hp}", True, (255,255,255)),
+        surface.blit(TEXT.render(f"{hp}/{max_hp}", 12, (255,255,255)),
                     (xpos + bar_w + 10, ypos))
 
         ypos += 25
@@ -601,11 +578,14 @@ class TowerDefense:
         # OTHER STATS
         # =====================
 
-        surface.blit(small.render(f"MONEY : {self.money_system.money}", True, (255,255,0)),
+        wave_totals = self.money_system.ledger.wave_totals()
+        surface.blit(TEXT.render(f"MONEY : {self.money_system.money}", 12, (255,255,0)),
                     (xpos, ypos))
+        surface.blit(TEXT.render(f"+{wave_totals.earned} / -{wave_totals.spent} this wave", 12, (200,200,120)),
+                    (xpos + 150, ypos))
         ypos += 18
 
-        surface.blit(small.render(f"WAVE  : {self.wave_director.ai.wave_number - 1}", True, (255,255,255)),
+        surface.blit(TEXT.render(f"WAVE  : {self.wave_director.ai.wave_number - 1}", 12, (255,255,255)),
                     (xpos, ypos))
         ypos += 18
 
@@ -614,20 +594,61 @@ class TowerDefense:
         else:
             time_str = "00:00"
 
-        surface.blit(small.render(f"TIME  : {time_str}", True, (255,255,255)),
+        surface.blit(TEXT.render(f"TIME  : {time_str}", 12, (255,255,255)),
                     (xpos, ypos))
         ypos += 18
 
-        cas = getattr(self.wave_director.ai, "casualties", 0)
-        surface.blit(small.render(f"KILLS : {cas}", True, (255,120,120)),
+        cas = self.money_system.ledger.totals.kills
+        surface.blit(TEXT.render(f"KILLS : {cas}", 12, (255,120,120)),
                     (xpos, ypos))
+
+        self.renderer.mark_static("hud", (panel_x, panel_y, panel_w, panel_h),
+                                  (hp, max_hp, self.money_system.money, self.wave_director.ai.wave_number, time_str, cas,
+                                   wave_totals.earned, wave_totals.spent))
     
+    def draw_debug_overlay(self, surface):
+        """Projectile pool and asset cache counters (toggled with F3)."""
+        lines = []
+        for (tower_type, headless), pool in PROJECTILE_POOLS.items():
+            if headless:
+                continue
+            s = pool.stats()
+            lines.append(f"{tower_type}: pool {s['size']}  live {s['live']}  "
+                        f"peak {s['peak_live']}  reuse {s['reuse_rate']:.0%}")
+        cache = ASSETS.stats()
+        lines.append(f"assets: {cache['items']} cached  hit rate {cache['hit_rate']:.0%}")
+        text = TEXT.stats()
+        lines.append(f"text: {text['fonts']} fonts  {text['items']} cached  hit rate {text['hit_rate']:.0%}")
+        mode = "dirty" if self.renderer.enabled else "full"
+        lines.append(f"renderer (F2): {mode}  {self.renderer.rect_count} rects  "
+                    f"{self.renderer.pixels // 1000}k px")
+
+        xpos, ypos = 10, 10
+        panel = pygame.Surface((420, len(lines) * 16 + 10), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 150))
+        surface.blit(panel, (xpos - 5, ypos - 5))
+        for line in lines:
+            surface.blit(TEXT.render(line, 12, (255, 255, 255)), (xpos, ypos))
+            ypos += 16
+        self.renderer.mark_static("debug", panel.get_rect(topleft=(xpos - 5, 5)), tuple(lines))
+
+    def draw_profiler(self, surface):
+        """Frame-time breakdown and graph (toggled with F4, F5 writes it to profiles/)."""
+        projectiles = sum(len(tower.projectiles) for tower in self.placed_towers)
+        PROFILER.count("monsters", len(self.monsters))
+        PROFILER.count("projectiles", projectiles)
+        PROFILER.count("sprites", len(self.all_sprites))
+        rect, version = PROFILER.draw(surface, (self.GAME_WIDTH - 10, 10))
+        self.renderer.mark_static("profiler", rect, version)
+
     # -----------------------------------------------
     # Main game loop
     # -----------------------------------------------
     def run(self):
         while self.running:
-            dt = self.clock.tick(60) / 1000
+            PROFILER.begin_frame()
+            dt = self.clock.tick(self.fps) / 1000
+            PROFILER.mark("wait")
             window_w, window_h = self.screen.get_size()
             scale_x = window_w / self.GAME_WIDTH
             scale_y = window_h / self.GAME_HEIGHT
@@ -651,23 +672,52 @@ class TowerDefense:
                             self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
                         else:
                             self.screen = pygame.display.set_mode((window_w, window_h), pygame.RESIZABLE)
+                        self.renderer.invalidate()
                     
                     if event.key == pygame.K_SPACE:
-                        self.wave_director.force_next_wave = True
+                        if self.inGame:
+                            self.simulation.force_wave()
+
+                    if event.key == pygame.K_f and self.inGame:
+                        self.cycle_time_scale()
+
+                    if event.key == pygame.K_F4:
+                        PROFILER.toggle()
+
+                    if event.key == pygame.K_F5:
+                        PROFILER.dump()
+
+                    if event.key == pygame.K_F3:
+                        self.show_debug = not self.show_debug
+
+                    if event.key == pygame.K_F2:
+                        self.renderer.enabled = not self.renderer.enabled
+                        self.renderer.invalidate()
+                        self.settings["renderer"] = "dirty" if self.renderer.enabled else "full"
+
+                    if event.key == pygame.K_F6:
+                        i = RENDER_RATES.index(self.fps) if self.fps in RENDER_RATES else 0
+                        self.fps = RENDER_RATES[(i + 1) % len(RENDER_RATES)]
+                        self.settings["fps"] = self.fps
+                        log.info("Frame cap: %s", self.fps or "uncapped")
 
                 elif event.type == pygame.VIDEORESIZE and not self.fullscreen:
                     self.screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
+                    self.renderer.invalidate()
 
                 # --- Mouse Input ---
                 elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    if self.inGame and not self.dragging_tower and self.speed_button.collidepoint(game_mouse):
+                        self.cycle_time_scale()
+                        continue
+
                     if self.dragging_tower:
                         px, py = self.dragging_tower.rect.center
                         # Check if tower can be placed
                         if self.can_place_tower((px, py), self.dragging_tower.rect.size):
                             # Try spending money
-                            if self.money_system.on_tower_placed():
-                                self.all_sprites.add(self.dragging_tower)
-                                self.placed_towers.append(self.dragging_tower)
+                            if self.simulation.buy_tower(self.dragging_tower):
+                                self.placement.add(self.dragging_tower)
                                 print(f"{self.dragging_tower} placed!")
                             else:
                                 print("Not enough money to place this tower!")
@@ -692,7 +742,8 @@ class TowerDefense:
                             size=tower_btn.get("size", (64, 64)),
                             money_system=self.money_system,  # pass reference
                             tower_type=tower_btn["name"].lower().replace(" ", "_"),
-                            sound_path=tower_btn.get("sound")
+                            sound_path=tower_btn.get("sound"),
+                            targeting=tower_btn.get("targeting", "nearest")
                         )
                             break
 
@@ -700,14 +751,12 @@ class TowerDefense:
                     self.selected_tower = None
                     for tower in self.placed_towers:
                         if tower.delete_button and tower.delete_button.collidepoint(game_mouse):
-                            self.all_sprites.remove(tower)
-                            self.placed_towers.remove(tower)
+                            self.simulation.remove_tower(tower)
+                            self.placement.remove(tower)
                             break
                         elif tower.upgrade_button and tower.upgrade_button.collidepoint(game_mouse):
                             # Check if player has enough money to upgrade tower
-                            if self.money_system.on_tower_upgraded():
-                                tower.upgrade()
-                            else:
+                            if not self.simulation.upgrade_tower(tower):
                                 print("Not enough money to upgrade tower!")
                             break
                         elif tower.rect.collidepoint(game_mouse):
@@ -867,7 +916,6 @@ class TowerDefense:
                                             self.ui_sprites.remove(elem)
                                         except Exception:
                                             pass
-                                    self.load_display_settings()
                                     self.start_screen()
                                 elif ui.name == "map_1":
                                     self.map_selected = True
@@ -913,9 +961,8 @@ class TowerDefense:
                         # Check if tower can be placed
                         if self.can_place_tower((px, py), self.dragging_tower.rect.size):
                             # Try spending money
-                            if self.money_system.on_tower_placed():
-                                self.all_sprites.add(self.dragging_tower)
-                                self.placed_towers.append(self.dragging_tower)
+                            if self.simulation.buy_tower(self.dragging_tower):
+                                self.placement.add(self.dragging_tower)
                                 print(f"{self.dragging_tower} placed!")
                             else:
                                 print("Not enough money to place this tower!")
@@ -924,15 +971,24 @@ class TowerDefense:
                         # Clear dragging tower regardless of placement
                         self.dragging_tower = None
 
-            # --- Update Sprites ---
-            if self.inGame:
-                self.all_sprites.update(dt)
-                self.castles.update(dt)
+            PROFILER.mark("events")
 
-                for tower in self.placed_towers:
-                    tower.update(dt, self.monsters, self.all_sprites)
-                
-                self.wave_director.update(dt, self.placed_towers)
+            # --- Update Sprites ---
+            # Fixed-step simulation: as many ticks as this frame's time covers, the
+            # remainder carries over and sets how far between two ticks we draw
+            alpha = 1.0
+            if self.inGame and self.time_scale == 0:
+                # Max speed: tick for a fixed budget, then draw just this one frame
+                deadline = time.perf_counter() + MAX_SPEED_BUDGET
+                while time.perf_counter() < deadline:
+                    self.simulation.step()
+            elif self.inGame:
+                # 2x / 4x: more simulated time per frame, still whole fixed ticks
+                self.accumulator += min(dt, MAX_FRAME_TIME) * self.time_scale
+                while self.accumulator >= self.simulation.dt:
+                    self.simulation.step()
+                    self.accumulator -= self.simulation.dt
+                alpha = self.accumulator / self.simulation.dt
 
             if self.show_start or self.show_map:
                 self.ui_sprites.update(dt, game_mouse)
@@ -945,34 +1001,32 @@ class TowerDefense:
                 self.game_bgmusic.set_volume(self.slider_music.get_value()/100)
                 self.button_sfx.set_volume(self.slider_sfx.get_value()/100)
                 self.hover_sfx.set_volume(self.slider_sfx.get_value()/100)
-
-            # --- Collisions ---
-            hits = pygame.sprite.groupcollide(self.castles, self.monsters, False, False)
-            for castle, monsters in hits.items():
-
-                # AUTO-SELECT THE CORRECT CASTLE THE FIRST TIME IT TAKES DAMAGE
-                if self.main_castle is None:
-                    self.main_castle = castle
-
-                for monster in monsters:
-                    castle.take_damage(getattr(monster, "damage", 10))
-                    monster.kill()
+                PROFILER.mark("menus")
 
             # --- Drawing ---
-            self.game_surface.fill("grey")
+            if not self.inGame:
+                self.game_surface.fill("grey")  # in game the baked background covers it
 
             if self.inGame:
+                # Only last frame's drawings are erased; the rest of the map is still there
+                self.renderer.restore(self.game_surface, self.all_sprites.background)
                 self.all_sprites.set_target_surface(self.game_surface)
-                self.all_sprites.draw()
+                drawn = self.all_sprites.draw(background=False, previous=self.simulation.previous, alpha=alpha)
+                for rect in drawn.values():
+                    self.renderer.mark(rect)
+                PROFILER.mark("draw")
 
                 # Draw right-side HUD (castle HP, money, wave, time)
                 self.draw_right_hud(self.game_surface)
+                self.draw_speed_button(self.game_surface, game_mouse)
                 # --- draw castle health ---
                 for castle in self.castles:
-                    castle.draw_health(self.game_surface)
+                    bar = castle.draw_health(self.game_surface)
+                    if bar:
+                        self.renderer.mark_static(("castle", id(castle)), bar, castle.hp)
 
                 for monster in self.monsters:
-                    monster.draw_hp(self.game_surface)
+                    self.renderer.mark(monster.draw_hp(self.game_surface, drawn.get(monster)))
             # Tower UI (selection, range, buttons)
                 self.draw_tower_ui(self.game_surface)
 
@@ -999,8 +1053,9 @@ class TowerDefense:
                     
                     # Blit overlay and tower image
                     self.game_surface.blit(overlay, (pos[0] - nw // 2, pos[1] - nh // 2))
-                    self.game_surface.blit(self.dragging_tower.image, self.dragging_tower.rect.topleft)\
-                
+                    self.game_surface.blit(self.dragging_tower.image, self.dragging_tower.rect.topleft)
+                    self.renderer.mark(self.dragging_tower.rect.union(outline_rect))
+
                 panel_x = 0
                 panel_y = self.GAME_HEIGHT - 120
                 panel_w = 420
@@ -1010,8 +1065,6 @@ class TowerDefense:
                 pygame.draw.rect(self.game_surface, (60, 40, 30), (panel_x, panel_y, panel_w, panel_h), border_radius=12)
                 pygame.draw.rect(self.game_surface, (100, 80, 60), (panel_x, panel_y, panel_w, panel_h), 2, border_radius=12)
 
-                font_small = pygame.font.Font("assets/Monocraft.ttc", 12)   # SHRUNK FONT
-
                 for tower_btn in self.tower_menu:
                     x, y = tower_btn["rect"].topleft
 
@@ -1023,12 +1076,22 @@ class TowerDefense:
                     self.game_surface.blit(tower_btn["icon"], tower_btn["rect"].topleft)
 
                     # Tower name (smaller text)
-                    name_text = font_small.render(tower_btn["name"], True, (255, 255, 255))
+                    name_text = TEXT.render(tower_btn["name"], 12, (255, 255, 255))   # SHRUNK FONT
                     self.game_surface.blit(name_text, (x, y - 18))
 
                     # Price
-                    price_text = font_small.render(f"${self.money_system.TOWER_COST}", True, (0, 255, 0))
+                    price_text = TEXT.render(f"${self.money_system.TOWER_COST}", 12, (0, 255, 0))
                     self.game_surface.blit(price_text, (x, y + tower_btn["rect"].height + 3))
+
+                self.renderer.mark_static("tower_menu", (panel_x, panel_y, panel_w, panel_h), self.money_system.TOWER_COST)
+
+                PROFILER.mark("hud")
+
+                if self.show_debug:
+                    self.draw_debug_overlay(self.game_surface)
+                if PROFILER.enabled:
+                    self.draw_profiler(self.game_surface)
+                PROFILER.mark("overlays")
             # Draw UI
             if self.show_start:
                 self.ui_sprites.set_target_surface(self.game_surface)
@@ -1037,19 +1100,25 @@ class TowerDefense:
                 self.slider_music.handle_event(event, (gx, gy))
                 self.slider_sfx.handle_event(event, (gx, gy))
 
-            # Draw tower menu with name and price
-            
-            # Scale game surface to window
-            scaled_surface = pygame.transform.smoothscale(self.game_surface, (window_w, window_h))
-            self.screen.fill("black")
-            self.screen.blit(scaled_surface, (offset_x, offset_y))
-            pygame.display.update()
-
+            # Scale game surface to window (only the dirty parts when in game)
+            self.renderer.present(self.game_surface, self.screen)
+
+        if PROFILER.enabled:
+            PROFILER.dump()
+        self.money_system.ledger.close()
+        # Debounced saves still waiting on their timer
+        self.settings.flush()
+        self.upgrade_store.flush()
+        # Seed + player actions of the last game, for python simulation.py --replay
+        if hasattr(self, "simulation"):
+            self.simulation.replay.save(LAST_REPLAY)
         pygame.quit()
 
 # -----------------------------------------------
 # Run game
 # -----------------------------------------------
 if __name__ == "__main__":
+    # LOG_LEVEL=DEBUG python main.py shows every money transaction
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "WARNING").upper(), format="%(name)s: %(message)s")
     game = TowerDefense()
     game.run()
@@ -0,0 +1,262 @@
+"""
+Compiled maps: everything setup() needs from a Tiled map, cached on disk so
+a game start doesn't re-parse the TMX and its tilesets.
+
+    python map_bundle.py assets/data/tmx/finals.tmx     # compile now
+
+A bundle is a small JSON file (castles, objects, both waypoint polylines)
+plus .npy arrays loaded with a memory map: the ground GID grid and the
+pre-baked background. It is rebuilt when the TMX, one of its .tsx files or
+an image they use changes (size/mtime, then SHA-1), so edits in Tiled or to
+the tileset PNGs still show up.
+Without NumPy the map is read from the TMX every time, as before.
+"""
+import json
+import os
+import re
+from os.path import join
+
+import pygame
+import pytmx
+from pytmx.util_pygame import load_pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from settings import TILE_SIZE
+from atlas import file_stamp, file_sha1
+from castle import CastleBox
+from sprites import Sprites, Objects, bake_static_layer
+
+CACHE_DIR = join("assets", "cache", "maps")
+WAYPOINT_LAYERS = ("Waypoints1", "Waypoints2")
+OBJECT_LAYERS = ("House", "decoration", "fences")
+VERSION = 1
+
+
+class MapBundle:
+    """
+    size:        map size in pixels
+    ground:      ground layer GIDs, [row][col] (pytmx internal gids)
+    castles:     [{"x", "y", "w", "h", "has_hp"}] for castle image objects
+    objects:     [{"layer", "x", "y", "w", "h"}] houses, decoration, fences
+    waypoints:   {"Waypoints1": [(x, y), ...], "Waypoints2": [...]}
+    background:  baked static layer Surface (None for headless loads)
+    """
+
+    def __init__(self, meta, ground, background=None):
+        self.size = tuple(meta["size"])
+        self.castles = meta["castles"]
+        self.objects = meta["objects"]
+        self.waypoints = {name: [tuple(p) for p in points] for name, points in meta["waypoints"].items()}
+        self.ground = ground
+        self.background = background
+
+    def build_castles(self, group=None):
+        """Image-less CastleBoxes (the castles themselves are in the background)."""
+        castles = pygame.sprite.Group() if group is None else group
+        for c in self.castles:
+            castle = CastleBox((c["x"], c["y"]), c["w"], c["h"], castles, image=None)
+            castle.has_hp = c["has_hp"]
+        return castles
+
+
+# -----------------------------
+# Compiling
+# -----------------------------
+def tileset_paths(tmx_path):
+    """External .tsx files a TMX refers to."""
+    with open(tmx_path, "r", encoding="utf-8") as f:
+        sources = re.findall(r'<tileset[^>]*\bsource="([^"]+)"', f.read())
+    folder = os.path.dirname(tmx_path)
+    return [os.path.normpath(join(folder, source)) for source in sources]
+
+
+def image_paths(path):
+    """Images a .tmx / .tsx draws from (tileset sheets, image-collection tiles)."""
+    with open(path, "r", encoding="utf-8") as f:
+        sources = re.findall(r'<image[^>]*\bsource="([^"]+)"', f.read())
+    folder = os.path.dirname(path)
+    return [os.path.normpath(join(folder, source)) for source in sources]
+
+
+def source_files(tmx_path):
+    """Everything the bundle is built from: the TMX, its tilesets and their images."""
+    tilesets = tileset_paths(tmx_path)
+    images = []
+    for path in [tmx_path] + tilesets:
+        images += image_paths(path)
+    # A missing image is left out; the tiles that use it bake as nothing either way
+    images = [path for path in images if os.path.exists(path)]
+    return list(dict.fromkeys([tmx_path] + tilesets + images))
+
+
+def save_array(path, array):
+    # Write then rename, so parallel runs (balance.py workers) never read half a file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def save_meta(path, meta):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(meta, f, indent=1)
+    os.replace(tmp, path)
+
+
+def read_map(tmx_data):
+    """Bundle metadata + ground grid from a parsed TiledMap (with or without images)."""
+    castles = []
+    for obj in tmx_data.get_layer_by_name("castle"):
+        if obj.gid:  # only image objects are drawn (and collide) in the game
+            castles.append({"x": obj.x, "y": obj.y, "w": obj.width, "h": obj.height,
+                            "has_hp": bool(obj.properties.get("hp_castle", False))})
+
+    objects = []
+    for layer_name in OBJECT_LAYERS:
+        for obj in tmx_data.get_layer_by_name(layer_name):
+            objects.append({"layer": layer_name, "x": obj.x, "y": obj.y, "w": obj.width, "h": obj.height})
+
+    waypoints = {}
+    for layer_name in WAYPOINT_LAYERS:
+        waypoints[layer_name] = [(p.x, p.y) for p in tmx_data.get_layer_by_name(layer_name)]
+
+    meta = {
+        "size": [tmx_data.width * tmx_data.tilewidth, tmx_data.height * tmx_data.tileheight],
+        "castles": castles,
+        "objects": objects,
+        "waypoints": waypoints,
+    }
+    ground = [list(row) for row in tmx_data.get_layer_by_name("Ground").data]
+    return meta, ground
+
+
+def bake_background(tmx_data, size):
+    """The static map (ground, castles, houses, decoration, fences) in one Surface."""
+    static_sprites = pygame.sprite.Group()
+    for x, y, image in tmx_data.get_layer_by_name("Ground").tiles():
+        Sprites((x * TILE_SIZE, y * TILE_SIZE), image, static_sprites)
+    for obj in tmx_data.get_layer_by_name("castle"):
+        if obj.image is not None:
+            CastleBox((obj.x, obj.y), obj.width, obj.height, static_sprites, image=obj.image)
+    for layer_name in OBJECT_LAYERS:
+        for obj in tmx_data.get_layer_by_name(layer_name):
+            Objects((obj.x, obj.y), obj.image, (obj.width, obj.height), obj.rotation, static_sprites)
+    return bake_static_layer(static_sprites, size)
+
+
+def bundle_paths(tmx_path, cache_dir=CACHE_DIR):
+    name = os.path.splitext(os.path.basename(tmx_path))[0]
+    base = join(cache_dir, name)
+    return base + ".json", base + ".ground.npy", base + ".background.npy"
+
+
+def compile_map(tmx_path, background_size=None, cache_dir=CACHE_DIR):
+    """
+    Parse the TMX and write its bundle. With background_size the static layer
+    is baked too (needs a display); without it only the data is written.
+    """
+    if background_size:
+        tmx_data = load_pygame(tmx_path)
+    else:
+        tmx_data = pytmx.TiledMap(tmx_path)
+    meta, ground = read_map(tmx_data)
+
+    meta_path, ground_path, background_path = bundle_paths(tmx_path, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    ground = np.array(ground, dtype=np.int32)
+    save_array(ground_path, ground)
+
+    background = None
+    if background_size:
+        background = bake_background(tmx_data, background_size)
+        pixels = np.frombuffer(pygame.image.tobytes(background, "RGB"), dtype=np.uint8)
+        save_array(background_path, pixels.reshape(background_size[1], background_size[0], 3))
+
+    sources = source_files(tmx_path)
+    meta.update({
+        "version": VERSION,
+        "tmx": tmx_path,
+        "stamps": {path: file_stamp(path) for path in sources},
+        "hashes": {path: file_sha1(path) for path in sources},
+        "background_size": list(background_size) if background_size else None,
+    })
+    save_meta(meta_path, meta)
+
+    print(f"Compiled {tmx_path} -> {meta_path}")
+    return MapBundle(meta, ground, background)
+
+
+# -----------------------------
+# Loading
+# -----------------------------
+def is_fresh(meta, tmx_path, meta_path):
+    """Same sources as at compile time? Cheap stat first, hashes only if that differs."""
+    sources = source_files(tmx_path)
+    if sorted(sources) != sorted(meta["stamps"]):
+        return False
+    try:
+        if all(file_stamp(path) == meta["stamps"][path] for path in sources):
+            return True
+        if any(file_sha1(path) != meta["hashes"][path] for path in sources):
+            return False
+    except OSError:
+        return False
+
+    # Touched but not changed (checkout, save without edits): remember the new stamps
+    meta["stamps"] = {path: file_stamp(path) for path in sources}
+    save_meta(meta_path, meta)
+    return True
+
+
+def load_map_bundle(tmx_path, background_size=None, cache_dir=CACHE_DIR):
+    """
+    MapBundle for a TMX, compiling it first if there is no fresh bundle.
+    background_size: size of the baked background Surface, None to skip it.
+    """
+    if np is None:
+        tmx_data = load_pygame(tmx_path) if background_size else pytmx.TiledMap(tmx_path)
+        meta, ground = read_map(tmx_data)
+        background = bake_background(tmx_data, background_size) if background_size else None
+        return MapBundle(meta, ground, background)
+
+    meta_path, ground_path, background_path = bundle_paths(tmx_path, cache_dir)
+    try:
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return compile_map(tmx_path, background_size, cache_dir)
+
+    if (meta.get("version") != VERSION or not is_fresh(meta, tmx_path, meta_path)
+            or (background_size and meta["background_size"] != list(background_size))):
+        return compile_map(tmx_path, background_size, cache_dir)
+
+    ground = np.load(ground_path, mmap_mode="r")
+    background = None
+    if background_size:
+        pixels = np.load(background_path, mmap_mode="r")
+        background = pygame.image.frombuffer(np.ascontiguousarray(pixels), background_size, "RGB")
+        # convert() copies out of the memory map into display format
+        background = background.convert() if pygame.display.get_surface() else background.copy()
+    return MapBundle(meta, ground, background)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile a Tiled map into a cached bundle.")
+    parser.add_argument("tmx", nargs="?", default=join("assets", "data", "tmx", "finals.tmx"))
+    parser.add_argument("--size", default="1280x720", help="background size, WxH")
+    args = parser.parse_args()
+
+    if np is None:
+        raise SystemExit("map_bundle.py needs numpy (pip install numpy)")
+    pygame.init()
+    size = tuple(int(v) for v in args.size.split("x"))
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    compile_map(args.tmx, size)
@@ -2,12 +2,24 @@
 #                      MONEY SYSTEM 
 #               Tower Defense Game Logic
 # ============================================================
+import logging
+
+from ledger import (EconomyLedger, KILL_REWARD, WAVE_START_BONUS, WAVE_COMPLETE_BONUS,
+                    CASTLE_DEFENSE_BONUS, TOWER_PLACED, TOWER_UPGRADED, OTHER)
+
+# Transactions are logged at DEBUG (off unless a run turns it on)
+log = logging.getLogger("money")
+
+
 class MoneySystem:
 
-    def __init__(self, starting_money=200):
+    def __init__(self, starting_money=200, ledger=None):
         # Private money value
         self._money = starting_money
 
+        # Every transaction, in memory (and optionally a JSONL file)
+        self.ledger = ledger or EconomyLedger()
+
         # ---- Game Economy Values (editable anytime) ----
         self.TOWER_COST = 100
         self.UPGRADE_COST = 75
@@ -30,22 +42,24 @@ class MoneySystem:
         """Returns True if money is enough to pay for amount."""
         return self._money >= amount
 
-    def add(self, amount: int):
+    def add(self, amount: int, kind=OTHER):
         """Increases player's money."""
         self._money += amount
-        print(f"[MONEY] +{amount} → Total: {self._money}")
+        self.ledger.record(kind, amount, self._money)
+        log.debug("+%d %s -> %d", amount, kind, self._money)
 
-    def spend(self, amount: int) -> bool:
+    def spend(self, amount: int, kind=OTHER) -> bool:
         """
         Attempts to spend money.
         Returns True if transaction is successful.
         """
         if self.can_afford(amount):
             self._money -= amount
-            print(f"[MONEY] -{amount} → Total: {self._money}")
+            self.ledger.record(kind, -amount, self._money)
+            log.debug("-%d %s -> %d", amount, kind, self._money)
             return True
 
-        print("[MONEY] Transaction failed → Not enough funds!")
+        log.debug("%s refused: %d needed, %d available", kind, amount, self._money)
         return False
 
     # ----------------------------------------------------
@@ -54,24 +68,24 @@ class MoneySystem:
 
     def on_tower_placed(self) -> bool:
         """Called when player attempts to place a tower."""
-        return self.spend(self.TOWER_COST)
+        return self.spend(self.TOWER_COST, TOWER_PLACED)
 
     def on_tower_upgraded(self) -> bool:
         """Called when upgrading a tower."""
-        return self.spend(self.UPGRADE_COST)
+        return self.spend(self.UPGRADE_COST, TOWER_UPGRADED)
 
     def on_enemy_killed(self):
         """Called when a tower kills an enemy."""
-        self.add(self.REWARD_KILL)
+        self.add(self.REWARD_KILL, KILL_REWARD)
 
     def on_wave_start(self):
         """Called when a new wave begins."""
-        self.add(self.REWARD_WAVE_START)
+        self.add(self.REWARD_WAVE_START, WAVE_START_BONUS)
 
     def on_wave_completed(self):
         """Called when a wave is successfully cleared."""
-        self.add(self.REWARD_WAVE_COMPLETE)
+        self.add(self.REWARD_WAVE_COMPLETE, WAVE_COMPLETE_BONUS)
 
     def on_castle_defended(self):
         """Called if the castle survives the wave."""
-        self.add(self.REWARD_CASTLE_DEFENSE)
+        self.add(self.REWARD_CASTLE_DEFENSE, CASTLE_DEFENSE_BONUS)
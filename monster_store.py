@@ -0,0 +1,184 @@
+import numpy as np
+import pygame
+
+from enemy_types import enemy_template
+from monsters import Monster
+from path import PathTable
+
+# Index order of MonsterStore.direction
+DIRECTIONS = ("up", "down", "left", "right")
+UP, DOWN, LEFT, RIGHT = range(4)
+
+
+class MonsterStore:
+    """
+    Struct-of-arrays for monsters walking the same waypoint path.
+    step() advances every live monster in one vectorized NumPy pass, with
+    the same rules as Monster.move (speed px per tick, one tick spent on
+    each reached waypoint).
+    """
+
+    def __init__(self, waypoints, capacity=1024):
+        self.waypoints = np.asarray(waypoints, dtype=np.float64)
+        self.cumulative = np.asarray(PathTable(waypoints).cumulative)
+
+        self.pos = np.zeros((capacity, 2))
+        self.speed = np.zeros(capacity)
+        self.hp = np.zeros(capacity)
+        self.distance = np.zeros(capacity)  # walked along the path
+        self.waypoint = np.zeros(capacity, dtype=np.int64)  # index of the waypoint walked to
+        self.direction = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        self.count = 0      # slots ever handed out (high-water mark)
+        self.free = []      # dead slots to reuse
+
+        # Plain-list copies refreshed by step(), cheap for sprites to read
+        self.positions = []
+        self.directions = []
+
+    def __len__(self):
+        return int(self.alive[:self.count].sum())
+
+    def _grow(self):
+        capacity = len(self.alive) * 2
+        for name in ("pos", "speed", "hp", "distance", "waypoint", "direction", "alive"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def add(self, speed, hp):
+        """Allocate a slot at the start of the path and return its index."""
+        if self.free:
+            i = self.free.pop()
+        else:
+            if self.count == len(self.alive):
+                self._grow()
+            i = self.count
+            self.count += 1
+
+        self.pos[i] = self.waypoints[0]
+        self.speed[i] = speed
+        self.hp[i] = hp
+        self.distance[i] = 0.0
+        self.waypoint[i] = 1
+        self.direction[i] = DOWN
+        self.alive[i] = True
+
+        # Keep the list mirrors indexable before the next step()
+        while len(self.positions) < self.count:
+            self.positions.append(None)
+            self.directions.append(DOWN)
+        self.positions[i] = self.pos[i].tolist()
+        self.directions[i] = DOWN
+        return i
+
+    def remove(self, i):
+        self.alive[i] = False
+        self.free.append(i)
+
+    def step(self):
+        """Move every live monster one tick toward its current waypoint."""
+        n = self.count
+        last = len(self.waypoints)
+        active = np.flatnonzero(self.alive[:n] & (self.waypoint[:n] < last))
+
+        if active.size:
+            pos = self.pos[active]
+            wp = self.waypoint[active]
+            travel = self.waypoints[wp] - pos
+            tx, ty = travel[:, 0], travel[:, 1]
+            dist = np.hypot(tx, ty)
+
+            # Animation direction from the travel vector, as in Monster.move
+            self.direction[active] = np.where(
+                np.abs(tx) > np.abs(ty),
+                np.where(tx > 0, RIGHT, LEFT),
+                np.where(ty > 0, DOWN, UP)
+            )
+
+            # Move toward the waypoint; monsters standing on it advance the index
+            moving = dist > 0
+            step = np.where(moving, np.minimum(dist, self.speed[active]), 0.0)
+            scale = np.divide(step, dist, out=np.zeros_like(dist), where=moving)
+            self.pos[active] = pos + travel * scale[:, None]
+            self.distance[active] += step
+
+            arrived = active[~moving]
+            self.distance[arrived] = self.cumulative[self.waypoint[arrived]]
+            self.waypoint[arrived] += 1
+
+        self.positions = self.pos[:n].tolist()
+        self.directions = self.direction[:n].tolist()
+
+
+class StoredMonster(Monster):
+    """
+    Monster whose position, waypoint, distance and hp live in a MonsterStore.
+    The sprite keeps animation and hit flash; move() only reads back where
+    the store put it.
+    """
+
+    def __init__(self, enemy_type, waypoints, group, store, money_system=None, headless=False, path=None):
+        template = enemy_template(enemy_type)
+
+        # Slot first: Monster.__init__ assigns pos/hp through the properties below
+        self.store = store
+        self.index = store.add(template.speed, template.hp)
+        super().__init__(enemy_type, waypoints, group, money_system=money_system,
+                        headless=headless, path=path)
+
+    # --- Fields backed by the store ---
+    @property
+    def pos(self):
+        return pygame.Vector2(self.store.positions[self.index])
+
+    @pos.setter
+    def pos(self, value):
+        self.store.pos[self.index] = (value[0], value[1])
+        self.store.positions[self.index] = [value[0], value[1]]
+
+    @property
+    def hp(self):
+        return float(self.store.hp[self.index])
+
+    @hp.setter
+    def hp(self, value):
+        self.store.hp[self.index] = value
+
+    @property
+    def speed(self):
+        return float(self.store.speed[self.index])
+
+    @speed.setter
+    def speed(self, value):
+        self.store.speed[self.index] = value
+
+    @property
+    def distance(self):
+        return float(self.store.distance[self.index])
+
+    @distance.setter
+    def distance(self, value):
+        self.store.distance[self.index] = value
+
+    @property
+    def target_waypoint(self):
+        return int(self.store.waypoint[self.index])
+
+    @target_waypoint.setter
+    def target_waypoint(self, value):
+        self.store.waypoint[self.index] = value
+
+    def move(self):
+        # The store already moved every monster this tick
+        self.anim_dir = DIRECTIONS[self.store.directions[self.index]]
+        self.rect.center = self.store.positions[self.index]
+
+    def kill(self):
+        # The slot may be handed to a new monster right away, so free it once
+        if self.alive():
+            self.store.remove(self.index)
+        super().kill()
+
@@ -1,22 +1,25 @@
 from settings import *
-from enemy import ENEMY_TYPES
-import time
+from enemy import load_enemy
+from enemy_types import enemy_template
 
 class Monster(pygame.sprite.Sprite):
-    def __init__(self, enemy_type, waypoints, group, money_system=None):
+    def __init__(self, enemy_type, waypoints, group, money_system=None, headless=False, path=None):
         super().__init__(group)
 
-        data = ENEMY_TYPES[enemy_type]
-
-        # Stats
-        self.speed = data["speed"]
-        self.max_hp = data["hp"]
+        # Stats straight from the type's template (enemy_type: EnemyTemplate or its name)
+        template = enemy_template(enemy_type)
+        self.template = template
+        self.type = template.name
+        self.speed = template.speed
+        self.max_hp = template.hp
         self.hp = self.max_hp
-        self.damage = data["damage"]
-        self.flying = data["flying"]
+        self.damage = template.damage
+        self.flying = template.flying
 
-        # Get already-SCALED animations
-        self.anim = data["anim"]
+        # Get already-SCALED animations, loaded on first use (headless monsters have none)
+        data = None if headless else load_enemy(template.name)
+        self.anim = None if headless else data["anim"]
+        self.hit_anim = None if headless else data["hit_anim"]
 
         self.anim_dir = "down"
         self.frame = 0
@@ -27,15 +30,25 @@ class Monster(pygame.sprite.Sprite):
         self.pos = pygame.Vector2(waypoints[0])
         self.target_waypoint = 1
 
-        self.image = self.anim["down"][0]
-        self.rect = self.image.get_rect(center=self.pos)
+        # Distance walked along the path (for first/last targeting)
+        self.path = path
+        self.distance = 0.0
+
+        if self.anim:
+            self.image = self.anim["down"][0]
+            self.rect = self.image.get_rect(center=self.pos)
+        else:
+            # No surfaces in headless mode, only a hitbox the size of the frames
+            self.image = None
+            self.rect = pygame.Rect((0, 0), template.size)
+            self.rect.center = self.pos
 
         # Effects
         self.is_hit = False
         self.hit_timer = 0
         self.hit_duration = 0.15
 
-        self.original_image = self.image.copy()
+        self.original_image = self.image.copy() if self.image else None
 
         self.money_system = money_system
 
@@ -58,9 +71,13 @@ class Monster(pygame.sprite.Sprite):
 
         # Move toward waypoint
         if dist > 0:
-            self.pos += travel.normalize() * min(dist, self.speed)
+            step = min(dist, self.speed)
+            self.pos += travel.normalize() * step
+            self.distance += step
         else:
             self.pos = target
+            if self.path:
+                self.distance = self.path.cumulative[self.target_waypoint]  # no drift
             self.target_waypoint += 1
 
         self.rect.center = self.pos
@@ -69,6 +86,9 @@ class Monster(pygame.sprite.Sprite):
     # WALKING ANIMATION + HIT FLASH
     # -----------------------------
     def animate(self):
+        if not self.anim:
+            return
+
         frames = self.anim[self.anim_dir]
 
         # Frame stepping
@@ -76,15 +96,10 @@ class Monster(pygame.sprite.Sprite):
         if self.frame >= len(frames):
             self.frame = 0
 
-        self.image = frames[int(self.frame)]
-
-        # Hit flash overlay
+        # Hit flash: same frame from the pre-tinted set
         if self.is_hit:
-            flash = pygame.Surface(self.image.get_size(), pygame.SRCALPHA)
-            flash.fill((255, 0, 0, 120))
-            temp = self.image.copy()
-            temp.blit(flash, (0, 0))
-            self.image = temp
+            frames = self.hit_anim[self.anim_dir]
+        self.image = frames[int(self.frame)]
 
         # Keep rect centered on new frame size
         self.rect = self.image.get_rect(center=self.pos)
@@ -99,7 +114,7 @@ class Monster(pygame.sprite.Sprite):
             return
 
         self.is_hit = True
-        self.hit_timer = time.time()
+        self.hit_timer = self.hit_duration  # counts down with the simulation dt
 
     def die(self):
         if self.money_system:
@@ -109,22 +124,27 @@ class Monster(pygame.sprite.Sprite):
     # -----------------------------
     # HP BAR
     # -----------------------------
-    def draw_hp(self, surf):
+    def draw_hp(self, surf, rect=None):
+        # rect: where the sprite was drawn this frame (interpolated), defaults to self.rect
+        rect = rect or self.rect
         w, h = 28, 5
-        x = self.rect.centerx - w // 2
-        y = self.rect.top - 8
+        x = rect.centerx - w // 2
+        y = rect.top - 8
 
         pygame.draw.rect(surf, (255, 0, 0), (x, y, w, h))
         pygame.draw.rect(surf, (0, 255, 0), (x, y, int(w * self.hp / self.max_hp), h))
         pygame.draw.rect(surf, (0, 0, 0), (x, y, w, h), 1)
+        return pygame.Rect(x, y, w, h)
 
     # -----------------------------
     # UPDATE
     # -----------------------------
     def update(self, dt=None):
         # remove hit effect
-        if self.is_hit and (time.time() - self.hit_timer) >= self.hit_duration:
-            self.is_hit = False
+        if self.is_hit:
+            self.hit_timer -= dt if dt is not None else 1 / 60
+            if self.hit_timer <= 0:
+                self.is_hit = False
 
         self.move()
         self.animate()
@@ -0,0 +1,32 @@
+import math
+from bisect import bisect_right
+
+
+class PathTable:
+    """
+    Cumulative arc length along a waypoint polyline.
+    cumulative[i] is the distance walked when standing on waypoints[i],
+    so a monster's progress is a single float instead of (index, position).
+    """
+
+    def __init__(self, waypoints):
+        self.waypoints = [tuple(w) for w in waypoints]
+        self.cumulative = [0.0]
+        for (x0, y0), (x1, y1) in zip(self.waypoints, self.waypoints[1:]):
+            self.cumulative.append(self.cumulative[-1] + math.hypot(x1 - x0, y1 - y0))
+
+    @property
+    def length(self):
+        return self.cumulative[-1]
+
+    def point_at(self, distance):
+        """(x, y) after walking `distance` along the path (clamped to its ends)."""
+        cumulative = self.cumulative
+        if distance <= 0 or len(cumulative) < 2:
+            return self.waypoints[0]
+        if distance >= cumulative[-1]:
+            return self.waypoints[-1]
+        i = bisect_right(cumulative, distance) - 1
+        (x0, y0), (x1, y1) = self.waypoints[i], self.waypoints[i + 1]
+        t = (distance - cumulative[i]) / ((cumulative[i + 1] - cumulative[i]) or 1.0)
+        return (x0 + (x1 - x0) * t, y0 + (y1 - y0) * t)
@@ -0,0 +1,89 @@
+from settings import TILE_SIZE
+
+GRASS_GID = 1  # pytmx internal gid of the grass tile (the only buildable ground)
+
+
+class PlacementGrid:
+    """
+    Where towers may go, one byte per map tile.
+
+    buildable: 1 for grass tiles, from the Ground layer GIDs
+    occupied:  number of placed towers whose rect touches the tile
+
+    can_place() only looks at the handful of tiles under the tower instead
+    of every tile and every placed tower, so the drag preview can call it
+    every frame. Towers are added / removed as they are placed / deleted.
+    """
+
+    def __init__(self, ground, tile_size=TILE_SIZE):
+        self.tile_size = tile_size
+        self.rows = len(ground)
+        self.cols = len(ground[0]) if self.rows else 0
+        self.buildable = bytearray(self.cols * self.rows)
+        self.occupied = bytearray(self.cols * self.rows)
+        self.towers = {}  # tile index -> towers touching it
+
+        for y, row in enumerate(ground):
+            for x, gid in enumerate(row):
+                if gid == GRASS_GID:
+                    self.buildable[y * self.cols + x] = 1
+
+    def index(self, x, y):
+        """Tile index under a pixel, None outside the map."""
+        col, row = x // self.tile_size, y // self.tile_size
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+        return None
+
+    def cells(self, rect):
+        """Tile indices a rect touches. Off-map parts count as the edge tiles."""
+        ts = self.tile_size
+        left = min(max(rect.left // ts, 0), self.cols - 1)
+        right = min(max((rect.right - 1) // ts, 0), self.cols - 1)
+        top = min(max(rect.top // ts, 0), self.rows - 1)
+        bottom = min(max((rect.bottom - 1) // ts, 0), self.rows - 1)
+        return [row * self.cols + col for row in range(top, bottom + 1) for col in range(left, right + 1)]
+
+    # -----------------------------
+    # Placed towers
+    # -----------------------------
+    def add(self, tower):
+        for i in self.cells(tower.rect):
+            self.occupied[i] += 1
+            self.towers.setdefault(i, []).append(tower)
+
+    def remove(self, tower):
+        for i in self.cells(tower.rect):
+            towers = self.towers.get(i)
+            if towers and tower in towers:
+                towers.remove(tower)
+                self.occupied[i] -= 1
+
+    # -----------------------------
+    # Checks
+    # -----------------------------
+    def on_grass(self, rect):
+        """Any corner (or the bottom-center) of the rect on a grass tile."""
+        points = (
+            (rect.left, rect.top),
+            (rect.right, rect.top),
+            (rect.left, rect.bottom),
+            (rect.right, rect.bottom),
+            (rect.centerx, rect.bottom),
+        )
+        for x, y in points:
+            i = self.index(x, y)
+            if i is not None and self.buildable[i]:
+                return True
+        return False
+
+    def overlaps(self, rect):
+        for i in self.cells(rect):
+            if self.occupied[i]:
+                for tower in self.towers[i]:
+                    if rect.colliderect(tower.rect):
+                        return True
+        return False
+
+    def can_place(self, rect):
+        return self.on_grass(rect) and not self.overlaps(rect)
@@ -0,0 +1,203 @@
+"""
+Frame profiler: where a frame's milliseconds go (F4 in game, F5 dumps).
+
+The loop calls PROFILER.begin_frame() once per frame and PROFILER.mark(stage)
+after each stage; the time since the previous mark is booked on that stage,
+so the stages of a frame add up to the whole frame. Anything after the last
+mark shows up as "other". Disabled (the default) every call returns right
+away, so the marks can stay in the hot paths.
+"""
+import csv
+import json
+import os
+import time
+from collections import deque
+from os.path import join
+
+import pygame
+
+from text_cache import TEXT
+
+PROFILE_DIR = "profiles"
+HISTORY = 3600      # frames kept for dumps (a minute at 60 FPS)
+WINDOW = 240        # frames behind the averages, percentiles and graph
+REFRESH = 15        # frames between overlay redraws (keeps the numbers readable)
+TARGET_MS = 1000 / 60
+GRAPH_MAX_MS = 50
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))]
+
+
+class FrameProfiler:
+    def __init__(self, history=HISTORY, window=WINDOW):
+        self.enabled = False
+        self.frames = deque(maxlen=history)  # (total ms, {stage: ms}, {counter: value})
+        self.window = window
+        self.stages = []     # in first-seen order, for the overlay and CSV columns
+        self.counters = []
+        self.current = {}
+        self.counts = {}
+        self.start = self.last = None
+
+        # Overlay panel, redrawn every REFRESH frames
+        self.panel = None
+        self.version = 0
+        self.frames_since_refresh = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.start = None
+        self.current, self.counts = {}, {}
+        self.panel = None
+        print(f"Profiler {'on' if self.enabled else 'off'}")
+
+    # -----------------------------
+    # Recording
+    # -----------------------------
+    def begin_frame(self):
+        """Close the previous frame and start timing the next one."""
+        if not self.enabled:
+            return
+        if self.start is None:
+            now = time.perf_counter()
+        else:
+            self.mark("other")
+            now = self.last
+            self.frames.append(((now - self.start) * 1000, self.current, self.counts))
+            self.frames_since_refresh += 1
+        self.current, self.counts = {}, {}
+        self.start = self.last = now
+
+    def mark(self, stage):
+        if not self.enabled or self.start is None:
+            return
+        now = time.perf_counter()
+        ms = (now - self.last) * 1000
+        self.last = now
+        if stage in self.current:
+            self.current[stage] += ms
+        else:
+            self.current[stage] = ms
+            if stage not in self.stages:
+                self.stages.append(stage)
+
+    def count(self, name, value):
+        if not self.enabled:
+            return
+        self.counts[name] = value
+        if name not in self.counters:
+            self.counters.append(name)
+
+    # -----------------------------
+    # Stats
+    # -----------------------------
+    def summary(self, frames=None):
+        """avg / p50 / p95 / p99 / max of the frame and of each stage (ms)."""
+        if frames is None:
+            frames = list(self.frames)[-self.window:]
+        totals = sorted(f[0] for f in frames)
+        n = len(totals)
+
+        def stats(values):
+            values = sorted(values)
+            return {
+                "avg_ms": sum(values) / n if n else 0.0,
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "p99_ms": percentile(values, 99),
+                "max_ms": values[-1] if values else 0.0,
+            }
+
+        summary = {"frames": n, "fps": 1000 * n / sum(totals) if n else 0.0, "frame": stats(totals)}
+        # A stage missing from a frame took 0 ms in it
+        summary["stages"] = {stage: stats([f[1].get(stage, 0.0) for f in frames]) for stage in self.stages}
+        summary["counters"] = {name: frames[-1][2].get(name, 0) for name in self.counters} if n else {}
+        return summary
+
+    # -----------------------------
+    # Overlay
+    # -----------------------------
+    def draw(self, surface, topright):
+        """Blit the overlay; returns its rect and a state that only changes when it is redrawn."""
+        if self.panel is None or self.frames_since_refresh >= REFRESH:
+            self.panel = self.build_panel()
+            self.version += 1
+            self.frames_since_refresh = 0
+        rect = self.panel.get_rect(topright=topright)
+        surface.blit(self.panel, rect)
+        return rect, self.version
+
+    def build_panel(self):
+        summary = self.summary()
+        frame = summary["frame"]
+        lines = [
+            (f"frame {frame['avg_ms']:5.2f} ms  p95 {frame['p95_ms']:5.2f}  p99 {frame['p99_ms']:5.2f}  "
+             f"{summary['fps']:3.0f} fps", (255, 255, 255)),
+        ]
+        for stage in self.stages:
+            s = summary["stages"][stage]
+            lines.append((f"{stage:<11}{s['avg_ms']:6.2f} ms  p95 {s['p95_ms']:6.2f}", (200, 220, 255)))
+        if summary["counters"]:
+            lines.append(("  ".join(f"{name} {value}" for name, value in summary["counters"].items()),
+                          (255, 220, 120)))
+
+        width, graph_h = 360, 60
+        panel = pygame.Surface((width, len(lines) * 16 + graph_h + 20), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        # Numbers change on every refresh: render directly, not through the shared text cache
+        font = TEXT.font(12)
+        y = 5
+        for text, color in lines:
+            panel.blit(font.render(text, True, color), (5, y))
+            y += 16
+
+        # Frame-time graph: one column per frame, newest on the right, 16.7 ms line
+        top = y + 5
+        bottom = top + graph_h
+        totals = [f[0] for f in list(self.frames)[-(width - 10):]]
+        x = width - 5 - len(totals)
+        for ms in totals:
+            h = min(ms, GRAPH_MAX_MS) / GRAPH_MAX_MS * graph_h
+            color = (80, 220, 80) if ms <= TARGET_MS * 1.05 else (240, 200, 60) if ms <= 2 * TARGET_MS else (240, 70, 70)
+            pygame.draw.line(panel, color, (x, bottom), (x, bottom - h))
+            x += 1
+        target_y = bottom - TARGET_MS / GRAPH_MAX_MS * graph_h
+        pygame.draw.line(panel, (255, 255, 255, 120), (5, target_y), (width - 5, target_y))
+        return panel
+
+    # -----------------------------
+    # Dumps
+    # -----------------------------
+    def dump(self, folder=PROFILE_DIR):
+        """Every kept frame as CSV + a JSON summary of them. Returns both paths."""
+        frames = list(self.frames)
+        if not frames:
+            print("Profiler: nothing recorded yet")
+            return None
+
+        os.makedirs(folder, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        csv_path = join(folder, f"frames_{stamp}.csv")
+        json_path = join(folder, f"frames_{stamp}.json")
+
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "total_ms"] + [f"{s}_ms" for s in self.stages] + self.counters)
+            for i, (total, stages, counts) in enumerate(frames):
+                writer.writerow([i, f"{total:.4f}"]
+                                + [f"{stages.get(s, 0.0):.4f}" for s in self.stages]
+                                + [counts.get(name, "") for name in self.counters])
+
+        with open(json_path, "w") as f:
+            json.dump(self.summary(frames), f, indent=1)
+
+        print(f"Profile: {len(frames)} frames -> {csv_path}, {json_path}")
+        return csv_path, json_path
+
+
+# One profiler for the game loop, the simulation and the renderer
+PROFILER = FrameProfiler()
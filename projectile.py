@@ -1,31 +1,56 @@
 import pygame
+from asset_cache import ASSETS
 
 PROJECTILE_SIZE = (10, 10)
 
+
+def default_projectile_image():
+    """Simple red circle used when a tower has no projectile image."""
+    image = pygame.Surface(PROJECTILE_SIZE, pygame.SRCALPHA)
+    pygame.draw.circle(
+        image,
+        (255, 0, 0),
+        (PROJECTILE_SIZE[0] // 2, PROJECTILE_SIZE[1] // 2),
+        PROJECTILE_SIZE[0] // 2
+    )
+    return image
+
 class Projectile(pygame.sprite.Sprite):
-    def __init__(self, pos, target, damage, image=None, speed=300, groups=None):
+    def __init__(self, pos, target, damage, image=None, speed=300, groups=None, headless=False, owner=None):
         super().__init__(groups)
-        self.pos = pygame.Vector2(pos)
-        self.target = target
-        self.damage = damage
-        self.speed = speed
+        self.pool = None  # set by ProjectilePool for recycled projectiles
+        self.generation = 0  # bumped on every reset: a recycled projectile is a new flight
 
         # Image
-        if image is None:
+        if headless:
+            # Simulation only needs the hitbox
+            self.image = None
+            self.rect = pygame.Rect((0, 0), PROJECTILE_SIZE)
+        elif image is None:
             # Default simple circle projectile
-            self.image = pygame.Surface(PROJECTILE_SIZE, pygame.SRCALPHA)
-            pygame.draw.circle(
-                self.image,
-                (255, 0, 0),
-                (PROJECTILE_SIZE[0] // 2, PROJECTILE_SIZE[1] // 2),
-                PROJECTILE_SIZE[0] // 2
-            )
+            self.image = ASSETS.get(("projectile_circle", PROJECTILE_SIZE), default_projectile_image)
         else:
-            # Always scale custom projectile images
-            self.image = pygame.transform.scale(image.copy(), PROJECTILE_SIZE)
+            # Always scale custom projectile images (once per image, shared)
+            self.image = ASSETS.scale(image, PROJECTILE_SIZE)
 
-        self.rect = self.image.get_rect(center=self.pos)
+        if self.image is not None:
+            self.rect = self.image.get_rect()
+        self.reset(pos, target, damage, speed, owner)
 
+    def reset(self, pos, target, damage, speed, owner=None):
+        """(Re)aim this projectile; the image and rect size stay as they are."""
+        self.generation += 1
+        self.pos = pygame.Vector2(pos)
+        self.target = target
+        self.owner = owner  # tower that fired it, credited with the kill
+        self.damage = damage
+        self.speed = speed
+        self.rect.center = self.pos
+
+    def kill(self):
+        super().kill()
+        if self.pool is not None:
+            self.pool.release(self)
 
     def update(self, dt):
         if not self.target or not self.target.alive():
@@ -39,8 +64,103 @@ class Projectile(pygame.sprite.Sprite):
             # Hit target
             if hasattr(self.target, "take_damage"):
                 self.target.take_damage(self.damage)
+                if self.owner is not None and not self.target.alive():
+                    self.owner.kills += 1
             self.kill()
         else:
             direction.normalize_ip()
             self.pos += direction * self.speed * dt
             self.rect.center = self.pos
+
+
+# -----------------------------
+# Projectile recycling
+# -----------------------------
+class ProjectilePool:
+    """
+    Free list of Projectiles for one tower type. acquire() re-aims a spare
+    projectile instead of constructing a sprite; kill() hands it back.
+    """
+
+    def __init__(self, image=None, headless=False, prealloc=8):
+        self.image = image
+        self.headless = headless
+        self.free = []
+        self.flying = set()  # handed out and not back yet
+        self.allocated = 0
+        self.acquired = 0
+        self.reused = 0
+        self.live = 0
+        self.peak_live = 0
+
+        for _ in range(prealloc):
+            self.free.append(self._new())
+
+    def _new(self):
+        proj = Projectile((0, 0), None, 0, self.image, groups=(), headless=self.headless)
+        proj.pool = self
+        proj.in_pool = True
+        self.allocated += 1
+        return proj
+
+    def acquire(self, pos, target, damage, speed, groups=(), owner=None):
+        if self.free:
+            proj = self.free.pop()
+            self.reused += 1
+        else:
+            proj = self._new()
+
+        proj.in_pool = False
+        self.flying.add(proj)
+        proj.reset(pos, target, damage, speed, owner)
+        proj.add(*groups)
+
+        self.acquired += 1
+        self.live += 1
+        self.peak_live = max(self.peak_live, self.live)
+        return proj
+
+    def release(self, proj):
+        if proj.in_pool:  # already returned (killed twice)
+            return
+        proj.in_pool = True
+        proj.target = None
+        proj.owner = None
+        self.flying.discard(proj)
+        self.free.append(proj)
+        self.live -= 1
+
+    def reset(self):
+        """New game: take back whatever the last one left in flight, zero the per-game counters."""
+        for proj in list(self.flying):
+            proj.kill()  # out of the old game's groups, back on the free list
+        self.acquired = 0
+        self.reused = 0
+        self.peak_live = self.live
+
+    def stats(self):
+        return {
+            "size": self.allocated,
+            "free": len(self.free),
+            "live": self.live,
+            "peak_live": self.peak_live,
+            "reuse_rate": self.reused / self.acquired if self.acquired else 0.0,
+        }
+
+
+# One pool per (tower type, headless), shared by every tower of that type
+PROJECTILE_POOLS = {}
+
+
+def get_projectile_pool(tower_type, image=None, headless=False):
+    key = (tower_type, headless)
+    pool = PROJECTILE_POOLS.get(key)
+    if pool is None:
+        pool = PROJECTILE_POOLS[key] = ProjectilePool(image, headless)
+    return pool
+
+
+def reset_projectile_pools():
+    """Called when a game starts; pools outlive games, their projectiles shouldn't."""
+    for pool in PROJECTILE_POOLS.values():
+        pool.reset()
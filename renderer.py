@@ -0,0 +1,154 @@
+import math
+
+from settings import *
+from profiler import PROFILER
+
+# Past this many dirty rects (or this share of the screen) one full update is cheaper
+MAX_DIRTY_RECTS = 96
+MAX_DIRTY_AREA = 0.5
+PRESENT_MARGIN = 2
+SCALE_PADDING = 6
+
+
+class DirtyRectRenderer:
+    """
+    Presents the game surface to the window, re-scaling and updating only
+    the regions that changed since the last frame.
+
+    Each frame, whatever gets drawn on the game surface is marked:
+    - mark(rect): moving things (sprites, hp bars, overlays). Restored from
+      the background next frame and always presented.
+    - mark_static(key, rect, state): panels that are redrawn every frame but
+      only change with their state (HUD values). Restored every frame,
+      presented only when state differs from last frame.
+    """
+
+    def __init__(self, game_width, game_height, enabled=True):
+        self.game_rect = pygame.Rect(0, 0, game_width, game_height)
+        self.enabled = enabled  # False: every frame is a full redraw (old behaviour)
+        self.full_redraw = True
+        self.window_size = None
+
+        self.drawn = []         # rects drawn this frame (restored next frame)
+        self.moving = []        # the mark() subset of drawn
+        self.changed = []       # rects to present this frame
+        self.last_drawn = []
+        self.last_moving = []
+        self.static = {}        # key -> (rect, state) this frame
+        self.last_static = {}
+        self.restored = False
+
+        # Last frame's numbers, for the debug overlay
+        self.rect_count = 0
+        self.pixels = 0
+
+    def invalidate(self):
+        """Next present() updates the whole window (screen change, resize...)."""
+        self.full_redraw = True
+
+    # -----------------------------
+    # Marking
+    # -----------------------------
+    def mark(self, rect):
+        rect = pygame.Rect(rect)
+        self.drawn.append(rect)
+        self.moving.append(rect)
+        self.changed.append(rect)
+
+    def mark_static(self, key, rect, state):
+        rect = pygame.Rect(rect)
+        self.drawn.append(rect)
+        self.static[key] = (rect, state)
+        last = self.last_static.get(key)
+        if last != (rect, state):
+            self.changed.append(rect)
+            if last is not None and last[0] != rect:
+                self.changed.append(last[0])
+
+    # -----------------------------
+    # Frame
+    # -----------------------------
+    def restore(self, surface, background):
+        """Erase last frame's drawings by copying the background back over them."""
+        self.restored = True
+        if self.full_redraw or not self.enabled:
+            surface.blit(background, (0, 0))
+            return
+        for rect in self.last_drawn:
+            surface.blit(background, rect, area=rect)
+
+    def present(self, game_surface, screen):
+        window_size = screen.get_size()
+        if window_size != self.window_size:
+            self.window_size = window_size
+            self.full_redraw = True
+
+        # Panels that disappeared this frame must be presented one last time
+        for key, (rect, _) in self.last_static.items():
+            if key not in self.static:
+                self.changed.append(rect)
+        # So do last frame's sprites, where they were before moving
+        self.changed.extend(self.last_moving)
+
+        dirty = [r.clip(self.game_rect) for r in self.changed]
+        dirty = [r for r in dirty if r.w > 0 and r.h > 0]
+        area = sum(r.w * r.h for r in dirty)
+        if len(dirty) > MAX_DIRTY_RECTS or area > MAX_DIRTY_AREA * self.game_rect.w * self.game_rect.h:
+            self.full_redraw = True
+
+        if self.full_redraw or not self.enabled:
+            present_full(game_surface, screen)
+            self.rect_count, self.pixels = 1, self.window_size[0] * self.window_size[1]
+        else:
+            rects = self._present_rects(game_surface, screen, dirty)
+            PROFILER.mark("scale")
+            pygame.display.update(rects)
+            PROFILER.mark("flip")
+            self.rect_count, self.pixels = len(rects), sum(r.w * r.h for r in rects)
+
+        # A frame drawn without restore() (menus) leaves the surface unknown
+        self.full_redraw = not self.restored
+        self.restored = False
+        self.last_drawn, self.drawn = self.drawn, []
+        self.last_moving, self.moving = self.moving, []
+        self.last_static, self.static = self.static, {}
+        self.changed = []
+
+    def _to_window(self, rect):
+        """Game-surface rect -> smallest window rect covering it."""
+        sx = self.window_size[0] / self.game_rect.w
+        sy = self.window_size[1] / self.game_rect.h
+        x0, y0 = math.floor(rect.x * sx), math.floor(rect.y * sy)
+        x1, y1 = math.ceil(rect.right * sx), math.ceil(rect.bottom * sy)
+        return pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+
+    def _present_rects(self, game_surface, screen, dirty):
+        screen_rects = []
+
+        for rect in dirty:
+            if self.window_size == self.game_rect.size:
+                screen.blit(game_surface, rect, area=rect)
+                screen_rects.append(rect)
+                continue
+
+            # smoothscale of a sub-region is up to ~1px out of phase with a full-frame
+            # smoothscale, so present a margin around the rect (any bleed stays in an
+            # area that is presented again next frame) and scale from a wider source
+            # so the clamped edges of the sub-region never reach the window
+            dst = self._to_window(rect.inflate(2 * PRESENT_MARGIN, 2 * PRESENT_MARGIN).clip(self.game_rect))
+            src = rect.inflate(2 * SCALE_PADDING, 2 * SCALE_PADDING).clip(self.game_rect)
+            scaled_src = self._to_window(src)
+            scaled = pygame.transform.smoothscale(game_surface.subsurface(src), scaled_src.size)
+            screen.blit(scaled, dst, area=dst.move(-scaled_src.x, -scaled_src.y))
+            screen_rects.append(dst)
+
+        return screen_rects
+
+
+def present_full(game_surface, screen):
+    """Scale the whole game surface to the window and flip (the classic path)."""
+    scaled_surface = pygame.transform.smoothscale(game_surface, screen.get_size())
+    screen.blit(scaled_surface, (0, 0))
+    PROFILER.mark("scale")
+    pygame.display.update()
+    PROFILER.mark("flip")
@@ -0,0 +1,94 @@
+"""
+Replay logs: the seed of a game plus every player action, tagged with the
+simulation tick it happened before. Played back headlessly it reproduces
+the run tick for tick:
+
+    python simulation.py --replay replays/last.json
+
+Actions: "add" / "buy" a tower (type + position), "upgrade" / "remove"
+(index in the tower list), "wave" (space bar, next wave now). Ticks of a
+fixed length are not stored; only when the recording game stepped with
+frame times (the window loop) is every dt kept.
+"""
+import json
+import os
+from os.path import join
+
+REPLAY_DIR = "replays"
+LAST_REPLAY = join(REPLAY_DIR, "last.json")
+VERSION = 1
+
+
+class ReplayLog:
+    def __init__(self, seed, map_path=None, waypoint_layer="Waypoints1", tick_rate=60):
+        self.seed = seed
+        self.map_path = map_path
+        self.waypoint_layer = waypoint_layer
+        self.tick_rate = tick_rate
+        self.endless = False  # wave mode the game started in
+        self.first_wave = 1
+        self.events = []  # [tick, action, {data}]
+        self.ticks = 0    # length of the recorded game
+        self.dts = None   # per-tick dt, only once a tick wasn't 1 / tick_rate
+
+    def record(self, tick, action, **data):
+        self.events.append([tick, action, data])
+
+    def record_dt(self, tick, dt):
+        self.ticks = tick + 1
+        fixed = 1.0 / self.tick_rate
+        if self.dts is None:
+            if dt == fixed:
+                return
+            self.dts = [fixed] * tick
+        self.dts.append(dt)
+
+    def dt(self, tick):
+        """dt of a recorded tick (fixed past the end of the recording)."""
+        if self.dts is None or tick >= len(self.dts):
+            return 1.0 / self.tick_rate
+        return self.dts[tick]
+
+    # -----------------------------
+    # Files
+    # -----------------------------
+    def to_dict(self):
+        return {
+            "version": VERSION,
+            "seed": self.seed,
+            "map": self.map_path,
+            "waypoints": self.waypoint_layer,
+            "tick_rate": self.tick_rate,
+            "endless": self.endless,
+            "first_wave": self.first_wave,
+            "ticks": self.ticks,
+            "events": self.events,
+            "dts": self.dts,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != VERSION:
+            raise ValueError(f"Unsupported replay version: {data.get('version')}")
+        log = cls(data["seed"], data["map"], data["waypoints"], data["tick_rate"])
+        log.ticks = data["ticks"]
+        log.endless = data.get("endless", False)
+        log.first_wave = data.get("first_wave", 1)
+        log.events = [list(event) for event in data["events"]]
+        log.dts = data["dts"]
+        return log
+
+    def save(self, path=LAST_REPLAY):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+        os.replace(tmp, path)
+        print(f"Replay saved to {path} ({len(self.events)} actions)")
+
+    @classmethod
+    def load(cls, path=LAST_REPLAY):
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,378 @@
+import os
+if __name__ == "__main__":
+    # Headless runs never open a window or an audio device
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import json
+import time
+import random
+import logging
+import argparse
+
+from settings import *
+from monsters import Monster
+from tower import Tower
+from game_ai import WaveDirector
+from money import MoneySystem
+from spatial import SpatialGrid
+from path import PathTable
+from coverage import CoverageMap
+from map_bundle import load_map_bundle
+from replay import ReplayLog
+from projectile import reset_projectile_pools
+from profiler import PROFILER
+
+TICK_RATE = 60  # simulation steps per second
+MAP_PATH = join('assets', 'data', 'tmx', 'finals.tmx')
+TOWERS_PATH = join('assets', 'data', 'upgrades', 'towers.json')
+
+
+def load_tower_data(path=TOWERS_PATH):
+    """Tower stats from towers.json, keyed by display name ("Archer Tower", ...)."""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def tower_type_name(name):
+    """Same key the game uses for permanent upgrades: "Archer Tower" -> "archer_tower"."""
+    return name.lower().replace(" ", "_")
+
+
+class Simulation:
+    """
+    Game world without any rendering: monsters, towers, projectiles, waves,
+    money and castle HP. Each step() advances everything by one fixed tick.
+
+    TowerDefense drives the same object from its window loop (headless=False,
+    world=all_sprites); balancing runs and tests build one with from_tmx()
+    and step it as fast as the CPU allows.
+
+    All randomness comes from self.rng (seeded per game) and all timing from
+    the tick clock, so the seed plus self.replay (player actions by tick)
+    reproduces a game exactly, see from_replay().
+    """
+
+    def __init__(self, waypoints, castles, money_system=None, wave_director=None,
+                world=None, towers=None, tick_rate=TICK_RATE, headless=True, seed=None,
+                vectorized=False, interpolate=False, endless=False, first_wave=1):
+        self.waypoints = waypoints
+        self.path = PathTable(waypoints)  # cumulative distance along the waypoints
+        self.castles = castles
+        self.money_system = money_system or MoneySystem(starting_money=500)
+        self.wave_director = wave_director or WaveDirector(self.spawn_enemy, endless=endless)
+        self.wave_director.ai.wave_number = first_wave
+        self.headless = headless
+        # Projectiles still flying in a previous game go back to their pools
+        reset_projectile_pools()
+
+        # world = every sprite that gets update(dt) (all_sprites in the game)
+        self.world = world if world is not None else pygame.sprite.Group()
+        self.monsters = pygame.sprite.Group()
+        self.towers = towers if towers is not None else []
+        self.grid = SpatialGrid(TILE_SIZE)  # monster positions for tower targeting
+
+        # Optional NumPy store that moves all monsters in one pass
+        # (imported only here: numpy is optional and plain games don't need it)
+        self.store = None
+        if vectorized:
+            try:
+                from monster_store import MonsterStore, StoredMonster
+            except ImportError:
+                raise RuntimeError("vectorized=True needs numpy (pip install numpy)") from None
+            self.store = MonsterStore(waypoints)
+            self.stored_monster = StoredMonster
+
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.tick = 0
+        self.time = 0.0  # simulated seconds
+
+        # Window only: where each sprite was before the last tick, so frames
+        # between ticks can be drawn interpolated (AllSprite.draw)
+        self.interpolate = interpolate
+        self.previous = {}
+
+        # HUD castle: the one flagged with hp_castle in the map
+        self.main_castle = next((c for c in self.castles if c.has_hp), None)
+
+        # Every game gets its own seed (picked here if not given) so it can be replayed
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        self.wave_director.ai.rng = self.rng
+        self.wave_director.ai.clock = self.clock
+        self.wave_director.ai.coverage = CoverageMap(self.path)
+        self.replay = ReplayLog(self.seed, tick_rate=tick_rate)
+        self.replay.endless = endless
+        self.replay.first_wave = first_wave
+
+    # -----------------------------------------------
+    # Headless construction
+    # -----------------------------------------------
+    @classmethod
+    def from_tmx(cls, path=MAP_PATH, waypoint_layer="Waypoints1", **kwargs):
+        """Build a headless simulation from a Tiled map without loading any images."""
+        game_map = load_map_bundle(path)
+        castles = game_map.build_castles()
+        waypoints = game_map.waypoints[waypoint_layer]
+
+        kwargs.setdefault("headless", True)
+        sim = cls(waypoints, castles, **kwargs)
+        sim.replay.map_path = path
+        sim.replay.waypoint_layer = waypoint_layer
+        return sim
+
+    @classmethod
+    def from_replay(cls, log, **kwargs):
+        """Headless simulation set up to play back a ReplayLog, see play_replay()."""
+        path = log.map_path or MAP_PATH
+        return cls.from_tmx(path, log.waypoint_layer, seed=log.seed, tick_rate=log.tick_rate,
+                            endless=log.endless, first_wave=log.first_wave, **kwargs)
+
+    def build_tower(self, name, pos, tower_data=None, buy=False):
+        """
+        Place a tower by its towers.json name, without images or sounds.
+        buy=True pays for it first and returns None if the money isn't there.
+        """
+        if tower_data is None:
+            tower_data = load_tower_data()
+        tdata = tower_data[name]
+
+        tower = Tower(
+            pos,
+            [None],
+            [None] * len(tdata["build"]),
+            [None] * len(tdata["upgrades"]),
+            damage=tdata["damage"],
+            range_=tdata["range"],
+            fire_rate=tdata["fire_rate"],
+            projectile_speed=tdata["projectile_speed"],
+            size=tuple(tdata["size"]),
+            money_system=self.money_system,
+            tower_type=tower_type_name(name),
+            headless=True,
+            targeting=tdata.get("targeting", "nearest")
+        )
+        if buy:
+            return tower if self.buy_tower(tower) else None
+        self.add_tower(tower)
+        return tower
+
+    # -----------------------------------------------
+    # World changes
+    # -----------------------------------------------
+    def spawn_enemy(self, enemy_type):
+        """Spawns a monster of an EnemyTemplate (or type name) with its sprite and stats."""
+
+        # Create the Monster (animations & speed are handled inside)
+        if self.store is not None:
+            monster = self.stored_monster(
+                enemy_type=enemy_type,
+                waypoints=self.waypoints,
+                group=self.world,
+                store=self.store,
+                money_system=self.money_system,
+                headless=self.headless,
+                path=self.path
+            )
+        else:
+            monster = Monster(
+                enemy_type=enemy_type,
+                waypoints=self.waypoints,
+                group=self.world,
+                money_system=self.money_system,
+                headless=self.headless,
+                path=self.path
+            )
+
+        self.monsters.add(monster)
+        return monster
+
+    def add_tower(self, tower, bought=False):
+        self.world.add(tower)
+        self.towers.append(tower)
+        self.replay.record(self.tick, "buy" if bought else "add",
+                           tower=tower.tower_type, pos=list(tower.rect.center))
+
+    def buy_tower(self, tower):
+        """Pay the placement cost and add the tower; False if the player can't afford it."""
+        if not self.money_system.on_tower_placed():
+            return False
+        self.add_tower(tower, bought=True)
+        return True
+
+    def upgrade_tower(self, tower):
+        """Pay for and start an upgrade; False if the player can't afford it."""
+        if not self.money_system.on_tower_upgraded():
+            return False
+        self.replay.record(self.tick, "upgrade", index=self.towers.index(tower))
+        tower.upgrade()
+        return True
+
+    def remove_tower(self, tower):
+        self.replay.record(self.tick, "remove", index=self.towers.index(tower))
+        self.world.remove(tower)
+        self.towers.remove(tower)
+
+    def force_wave(self):
+        """Start the next wave without waiting (space bar)."""
+        self.replay.record(self.tick, "wave")
+        self.wave_director.force_next_wave = True
+
+    # -----------------------------------------------
+    # Stepping
+    # -----------------------------------------------
+    def clock(self):
+        """Simulated seconds, the AI's clock for wave cooldowns."""
+        return self.time
+
+    @property
+    def game_over(self):
+        return self.main_castle is not None and self.main_castle.hp <= 0
+
+    def step(self, dt=None):
+        """Advance the world by one tick (fixed dt unless told otherwise)."""
+        if dt is None:
+            dt = self.dt
+        self.replay.record_dt(self.tick, dt)
+        if self.interpolate:
+            self.previous = {sprite: sprite.rect.topleft for sprite in self.world}
+            # Pooled projectiles can be killed and fired again within this tick
+            flights = [(sprite, sprite.generation) for sprite in self.previous if hasattr(sprite, "generation")]
+
+        if self.store is not None:
+            self.store.step()
+        self.world.update(dt)
+        self.castles.update(dt)
+        PROFILER.mark("sprites")
+
+        # Monsters have moved: re-bucket them once for all towers
+        self.grid.rebuild(self.monsters)
+        PROFILER.mark("grid")
+
+        now = self.time * 1000
+        for tower in self.towers:
+            tower.update(dt, self.monsters, self.world, now=now, grid=self.grid)
+        PROFILER.mark("towers")
+
+        self.wave_director.update(dt, self.towers)
+        PROFILER.mark("waves")
+
+        # Monsters reaching the castle walls
+        hits = pygame.sprite.groupcollide(self.castles, self.monsters, False, False)
+        for castle, monsters in hits.items():
+            for monster in monsters:
+                castle.take_damage(getattr(monster, "damage", 10))
+                monster.kill()
+        PROFILER.mark("collisions")
+
+        if self.interpolate:
+            # ...their old position would blend them in from the last impact point
+            for sprite, generation in flights:
+                if sprite.generation != generation:
+                    del self.previous[sprite]
+
+        self.tick += 1
+        self.time += dt
+
+        # Money events between now and the next step belong to this tick / wave
+        ledger = self.money_system.ledger
+        ledger.tick = self.tick
+        ledger.wave = self.wave_director.ai.wave_number - 1
+
+    def run(self, max_ticks=None, max_waves=None):
+        """Step until the castle falls or a tick/wave limit is reached."""
+        while not self.game_over:
+            if max_ticks is not None and self.tick >= max_ticks:
+                break
+            if max_waves is not None and self.wave_director.ai.wave_number - 1 > max_waves:
+                break
+            self.step()
+        return self.tick
+
+    # -----------------------------------------------
+    # Replays
+    # -----------------------------------------------
+    def apply_action(self, action, data, tower_data):
+        if action in ("add", "buy"):
+            names = {tower_type_name(name): name for name in tower_data}
+            self.build_tower(names[data["tower"]], tuple(data["pos"]), tower_data, buy=(action == "buy"))
+        elif action == "upgrade":
+            self.upgrade_tower(self.towers[data["index"]])
+        elif action == "remove":
+            self.remove_tower(self.towers[data["index"]])
+        elif action == "wave":
+            self.force_wave()
+        else:
+            raise ValueError(f"Unknown replay action: {action}")
+
+    def play_replay(self, log, max_ticks=None):
+        """
+        Step through a recorded game: each action is applied right before the
+        tick it was recorded at, with the recorded dts, up to where the
+        recording ended (or max_ticks, or the castle falling).
+        """
+        tower_data = load_tower_data()
+        events = sorted(log.events, key=lambda e: e[0])  # stable: same-tick order kept
+        end = log.ticks if max_ticks is None else min(max_ticks, log.ticks)
+        i = 0
+        while True:
+            while i < len(events) and events[i][0] <= self.tick:
+                _, action, data = events[i]
+                self.apply_action(action, data, tower_data)
+                i += 1
+            if self.game_over or self.tick >= end:
+                break
+            self.step(log.dt(self.tick))
+        return self.tick
+
+
+# -----------------------------------------------
+# Run a single headless game from the command line
+# -----------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run one headless game")
+    parser.add_argument("--minutes", type=float, default=5.0, help="simulated minutes")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--vectorized", action="store_true", help="move monsters with NumPy")
+    parser.add_argument("--endless", action="store_true", help="budget-sized waves that keep growing")
+    parser.add_argument("--first-wave", type=int, default=1, help="wave to start at (e.g. 50 for big endless waves)")
+    parser.add_argument("--tower", action="append", default=[],
+                        help='tower placement "Name:x,y", e.g. "Archer Tower:400,500"')
+    parser.add_argument("--record", metavar="PATH", help="save the game as a replay log")
+    parser.add_argument("--replay", metavar="PATH", help="play back a replay log (ignores --seed/--tower/--minutes)")
+    parser.add_argument("--ledger", metavar="PATH", help="append every money event to this JSONL file")
+    parser.add_argument("--log-level", default="WARNING", help="DEBUG shows every transaction")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(name)s: %(message)s")
+    pygame.init()
+    if args.replay:
+        log = ReplayLog.load(args.replay)
+        sim = Simulation.from_replay(log, vectorized=args.vectorized)
+        print(f"Replaying {args.replay}: seed {log.seed}, {len(log.events)} actions, {log.ticks} ticks")
+    else:
+        sim = Simulation.from_tmx(seed=args.seed, vectorized=args.vectorized,
+                                  endless=args.endless, first_wave=args.first_wave)
+        for spec in args.tower:
+            name, xy = spec.rsplit(":", 1)
+            x, y = (float(v) for v in xy.split(","))
+            sim.build_tower(name, (x, y))
+
+    if args.ledger:
+        sim.money_system.ledger.path = args.ledger
+
+    start = time.perf_counter()
+    if args.replay:
+        ticks = sim.play_replay(log)
+    else:
+        ticks = sim.run(max_ticks=int(args.minutes * 60 * sim.tick_rate))
+    elapsed = time.perf_counter() - start
+
+    if args.record:
+        sim.replay.save(args.record)
+    if args.ledger:
+        sim.money_system.ledger.close()
+
+    castle_hp = sim.main_castle.hp if sim.main_castle else None
+    print(f"ticks: {ticks} ({ticks / max(elapsed, 1e-9):.0f} ticks/s, {elapsed:.2f}s wall)")
+    print(f"wave: {sim.wave_director.ai.wave_number - 1}  castle hp: {castle_hp}  money: {sim.money_system.money}")
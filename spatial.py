@@ -0,0 +1,61 @@
+from settings import *
+
+
+class SpatialGrid:
+    """
+    Uniform grid of live monsters bucketed by tile (TILE_SIZE px cells).
+    Rebuilt once per tick; towers ask for the monsters near their range
+    circle instead of scanning the whole monster group.
+    """
+
+    def __init__(self, cell_size=TILE_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def rebuild(self, sprites):
+        """Re-bucket every sprite by its rect center. O(number of sprites)."""
+        cells = {}
+        size = self.cell_size
+        for sprite in sprites:
+            x, y = sprite.rect.center
+            key = (int(x // size), int(y // size))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [sprite]
+            else:
+                bucket.append(sprite)
+        self.cells = cells
+
+    def query(self, center, radius):
+        """
+        Live sprites in cells touching the circle. Callers still do the exact
+        distance check; this only trims the candidates to the local area.
+        """
+        cx, cy = center
+        size = self.cell_size
+        cells = self.cells
+        radius_sq = radius * radius
+
+        x0, x1 = int((cx - radius) // size), int((cx + radius) // size)
+        y0, y1 = int((cy - radius) // size), int((cy + radius) // size)
+
+        found = []
+        for gx in range(x0, x1 + 1):
+            # Horizontal distance from the center to this column of cells
+            left = gx * size
+            dx = left - cx if cx < left else (cx - left - size if cx > left + size else 0)
+            for gy in range(y0, y1 + 1):
+                bucket = cells.get((gx, gy))
+                if not bucket:
+                    continue
+                top = gy * size
+                dy = top - cy if cy < top else (cy - top - size if cy > top + size else 0)
+                if dx * dx + dy * dy > radius_sq:
+                    continue  # corner cell outside the circle
+                for sprite in bucket:
+                    if sprite.alive():  # may have died earlier this tick
+                        found.append(sprite)
+        return found
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.cells.values())
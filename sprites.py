@@ -9,13 +9,44 @@ class AllSprite(pygame.sprite.Group):
         # store internal resolution
         self.game_width = game_width
         self.game_height = game_height
+
+        # Pre-rendered static map (ground, castles, houses...), drawn first
+        self.background = None
     
     def set_target_surface(self, surface):
         self.display = surface
 
-    def draw(self):
+    def set_background(self, surface):
+        self.background = surface
+
+    def draw(self, background=True, previous=None, alpha=1.0):
+        """
+        Blit every sprite; returns {sprite: rect it was drawn at}.
+        background=False when the caller already restored it (dirty-rect renderer).
+        previous: {sprite: topleft} one simulation tick ago; sprites in it are
+        drawn alpha of the way from there to where they are now.
+        """
+        if background and self.background is not None:
+            self.display.blit(self.background, (0, 0))
+        drawn = {}
         for sprite in self:
-            self.display.blit(sprite.image, sprite.rect.topleft)
+            x, y = sprite.rect.topleft
+            if previous:
+                last = previous.get(sprite)
+                if last is not None:
+                    x = round(last[0] + (x - last[0]) * alpha)
+                    y = round(last[1] + (y - last[1]) * alpha)
+            drawn[sprite] = self.display.blit(sprite.image, (x, y))
+        return drawn
+
+
+def bake_static_layer(sprites, size, fill="grey"):
+    """Blit static sprites once, in group order, into a single opaque Surface."""
+    layer = pygame.Surface(size).convert()
+    layer.fill(fill)
+    for sprite in sprites:
+        layer.blit(sprite.image, sprite.rect.topleft)
+    return layer
 
 class Sprites(pygame.sprite.Sprite):
     def __init__(self, pos, surface, groups):
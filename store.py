@@ -0,0 +1,123 @@
+"""
+Player data (settings, permanent upgrades): read once, kept in memory,
+written in the background.
+
+    settings = JsonStore("settings.json", "assets/data/settings.json")
+    settings.update(music=80)        # in memory now, on disk ~0.5 s later
+
+The files live in a per-user folder (FORTRESS_DATA_DIR, or SDL's pref path),
+never under assets/, so the assets folder can be read-only. The copy shipped
+in assets/ is only the starting point until the first save. Saves are
+debounced: a burst of changes ends up as one write, done on a timer thread
+into a temp file that is then renamed over the old one, so a crash mid-write
+leaves the previous file intact.
+"""
+import json
+import os
+import threading
+from os.path import join
+
+import pygame
+
+SAVE_DELAY = 0.5  # seconds of quiet before a save hits the disk
+
+
+def user_data_dir():
+    folder = os.environ.get("FORTRESS_DATA_DIR")
+    if not folder:
+        try:
+            folder = pygame.system.get_pref_path("", "FortressFrontline")
+        except (AttributeError, pygame.error):
+            folder = join(os.path.expanduser("~"), ".fortress_frontline")
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+class JsonStore:
+    def __init__(self, name, default_path=None, folder=None, defaults=None, delay=SAVE_DELAY):
+        self.path = join(folder or user_data_dir(), name)
+        self.default_path = default_path
+        self.delay = delay
+        self.lock = threading.Lock()        # pending / timer only, never held during file I/O
+        self.write_lock = threading.Lock()  # one write at a time, newest text last
+        self.timer = None
+        self.pending = None  # JSON text waiting for the timer
+
+        self.data = dict(defaults or {})
+        self.data.update(self.load())
+
+    def load(self):
+        for path in (self.path, self.default_path):
+            if path is None:
+                continue
+            try:
+                with open(path, "r") as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                print(f"WARNING: could not read {path}: {e}")
+        return {}
+
+    # -----------------------------
+    # Dict-like access
+    # -----------------------------
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+        self.save()
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def update(self, values=(), **more):
+        self.data.update(values, **more)
+        self.save()
+
+    # -----------------------------
+    # Writing
+    # -----------------------------
+    def save(self):
+        """Snapshot now, write once things have been quiet for `delay`."""
+        # Serialized here on the game thread: the timer never reads self.data
+        text = json.dumps(self.data, indent=4)
+        with self.lock:
+            self.pending = text
+            if self.timer is not None:
+                self.timer.cancel()
+            self.timer = threading.Timer(self.delay, self.write)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def write(self):
+        # Taking the newest text inside write_lock keeps an older snapshot
+        # from landing after a newer one; save() on the game thread only
+        # ever waits for the swap, not for the disk
+        with self.write_lock:
+            with self.lock:
+                text, self.pending = self.pending, None
+                self.timer = None
+            if text is None:
+                return
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp, "w") as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except OSError as e:
+                print(f"WARNING: could not save {self.path}: {e}")
+
+    def flush(self):
+        """Write a pending save right away (on quit)."""
+        with self.lock:
+            timer = self.timer
+        if timer is not None:
+            timer.cancel()
+        self.write()
@@ -0,0 +1,41 @@
+import pygame
+
+from asset_cache import AssetCache
+
+FONT_PATH = "assets/Monocraft.ttc"
+
+
+class TextCache:
+    """
+    Fonts loaded once per size, rendered text memoized on (text, size, color).
+    Static labels ("DELETE", "$100", tower names) are rendered once; values
+    like money or HP only re-render when they change. Rendered surfaces
+    are shared, so never draw onto them.
+    """
+
+    def __init__(self, font_path=FONT_PATH, max_items=256):
+        self.font_path = font_path
+        self.fonts = {}
+        self.surfaces = AssetCache(max_items)
+
+    def font(self, size):
+        try:
+            return self.fonts[size]
+        except KeyError:
+            font = self.fonts[size] = pygame.font.Font(self.font_path, size)
+            return font
+
+    def render(self, text, size, color, antialias=True):
+        if not isinstance(color, (tuple, str)):
+            color = tuple(color)  # keep the key hashable (lists, pygame.Color)
+        key = (text, size, color, antialias)
+        return self.surfaces.get(key, lambda: self.font(size).render(text, antialias, color))
+
+    def stats(self):
+        stats = self.surfaces.stats()
+        stats["fonts"] = len(self.fonts)
+        return stats
+
+
+# One cache for all HUD / menu text
+TEXT = TextCache()
@@ -1,17 +1,38 @@
 import pygame
+from asset_cache import ASSETS
+from projectile import get_projectile_pool
+
+# How a tower picks among the monsters in range (towers.json "targeting").
+# "nearest" is the distance check itself; the others maximize a key.
+TARGETING_KEYS = {
+    "first": lambda m: m.distance,       # furthest along the path
+    "last": lambda m: -m.distance,       # least far along the path
+    "strongest": lambda m: m.hp,
+    "weakest": lambda m: -m.hp,
+}
 
 class Tower(pygame.sprite.Sprite):
     def __init__(self, pos, idle_frames, building_frames, upgrade_frames,
                 damage=10, range_=100, fire_rate=1.0,
                 projectile_image=None, projectile_speed=300, size=(64, 64),
-                money_system=None, tower_type=None,sound_path=None):
+                money_system=None, tower_type=None,sound_path=None, headless=False,
+                targeting="nearest"):
 
         super().__init__()
         MAX_LEVEL = 3
+        self.headless = headless
         # --- Images ---
-        self.idle_frames = [pygame.transform.scale(img, size) for img in idle_frames]
-        self.building_frames = [pygame.transform.scale(img, size) for img in building_frames]
-        self.upgrade_frames = [pygame.transform.scale(img, size) for img in upgrade_frames]
+        if headless:
+            # Frame lists are only placeholders (e.g. [None, None]) so that
+            # building/upgrade timings still match the real animations
+            self.idle_frames = list(idle_frames)
+            self.building_frames = list(building_frames)
+            self.upgrade_frames = list(upgrade_frames)
+        else:
+            # Scaled frames are shared by every tower of this type (and the drag preview)
+            self.idle_frames = [ASSETS.scale(img, size) for img in idle_frames]
+            self.building_frames = [ASSETS.scale(img, size) for img in building_frames]
+            self.upgrade_frames = [ASSETS.scale(img, size) for img in upgrade_frames]
 
         # --- Animation & State ---
         self.state = "building"  # building, idle, upgrading
@@ -24,7 +45,11 @@ class Tower(pygame.sprite.Sprite):
         self.image = self.building_frames[0]
 
         # --- Position ---
-        self.rect = self.image.get_rect(center=(int(pos[0]), int(pos[1])))
+        if self.image is not None:
+            self.rect = self.image.get_rect(center=(int(pos[0]), int(pos[1])))
+        else:
+            self.rect = pygame.Rect((0, 0), size)
+            self.rect.center = (int(pos[0]), int(pos[1]))
 
         # --- Tower Stats ---
         self.range = range_
@@ -33,7 +58,12 @@ class Tower(pygame.sprite.Sprite):
         self.projectile_image = projectile_image
         self.projectile_speed = projectile_speed
         self.projectiles = pygame.sprite.Group()
-        self.last_shot = 0
+        self.projectile_pool = get_projectile_pool(tower_type, projectile_image, headless)
+        if targeting != "nearest" and targeting not in TARGETING_KEYS:
+            raise ValueError(f"Unknown targeting policy: {targeting}")
+        self.targeting = targeting
+        self.last_shot = float("-inf")  # first shot is never on cooldown
+        self.kills = 0
 
         # --- Apply permanent upgrades (global stat boosts) ---
         self.tower_type = tower_type
@@ -55,17 +85,17 @@ class Tower(pygame.sprite.Sprite):
         self.upgrade_button = None
 
         # --- Sound ---
-        if sound_path:
-            self.shoot_sound = pygame.mixer.Sound(sound_path)
+        if sound_path and not headless:
+            self.shoot_sound = ASSETS.sound(sound_path)
         else:
             self.shoot_sound = None
 
     # -----------------------------
     # Update per frame
     # -----------------------------
-    def update(self, dt, monsters=None, all_sprites=None):
+    def update(self, dt, monsters=None, all_sprites=None, now=None, grid=None):
         self._update_animation(dt)
-        self._attack(monsters, all_sprites)
+        self._attack(monsters, all_sprites, now, grid)
         self.projectiles.update(dt)
 
     # -----------------------------
@@ -121,25 +151,25 @@ class Tower(pygame.sprite.Sprite):
     # -----------------------------
     # Attack Logic
     # -----------------------------
-    def _attack(self, monsters, all_sprites):
+    def _attack(self, monsters, all_sprites, now=None, grid=None):
         if not monsters or self.state == "building":
             return
         
-        target = self.get_target(monsters)
+        target = self.get_target(monsters, grid)
         if target:
-            now = pygame.time.get_ticks()
+            # Simulation clock (ms) when stepped by Simulation, wall clock otherwise
+            if now is None:
+                now = pygame.time.get_ticks()
             if now - self.last_shot >= 1000 / self.fire_rate:
-                from projectile import Projectile
-                proj = Projectile(
+                groups = (self.projectiles, all_sprites) if all_sprites else (self.projectiles,)
+                self.projectile_pool.acquire(
                     self.rect.center,
                     target,
                     self.damage,
-                    self.projectile_image,
                     self.projectile_speed,
-                    self.projectiles
+                    groups,
+                    owner=self
                 )
-                if all_sprites:
-                    all_sprites.add(proj)
                 self.last_shot = now
                 if self.shoot_sound:
                     self.shoot_sound.play()
@@ -148,17 +178,38 @@ class Tower(pygame.sprite.Sprite):
         if self.money_system:
             self.money_system.on_enemy_killed()
 
-    def get_target(self, monsters):
-        nearest = None
-        min_dist_sq = self.range ** 2
+    def get_target(self, monsters, grid=None):
+        # With a SpatialGrid only monsters in nearby cells are checked
+        if grid is not None:
+            monsters = grid.query(self.rect.center, self.range)
+
+        if self.targeting == "nearest":
+            nearest = None
+            min_dist_sq = self.range ** 2
+            for m in monsters:
+                dx = m.rect.centerx - self.rect.centerx
+                dy = m.rect.centery - self.rect.centery
+                dist_sq = dx * dx + dy * dy
+                if dist_sq <= min_dist_sq:
+                    nearest = m
+                    min_dist_sq = dist_sq
+            return nearest
+
+        # One pass over the candidates, comparing a precomputed scalar
+        key = TARGETING_KEYS[self.targeting]
+        range_sq = self.range ** 2
+        cx, cy = self.rect.center
+        best = None
+        best_key = None
         for m in monsters:
-            dx = m.rect.centerx - self.rect.centerx
-            dy = m.rect.centery - self.rect.centery
-            dist_sq = dx * dx + dy * dy
-            if dist_sq <= min_dist_sq:
-                nearest = m
-                min_dist_sq = dist_sq
-        return nearest
+            dx = m.rect.centerx - cx
+            dy = m.rect.centery - cy
+            if dx * dx + dy * dy <= range_sq:
+                k = key(m)
+                if best is None or k > best_key:
+                    best = m
+                    best_key = k
+        return best
 
     # -----------------------------
     # Upgrade Tower
@@ -0,0 +1,62 @@
+"""
+Wave compiler: the AI's list of enemy names becomes a spawn schedule before
+the wave starts, so spawning during the wave is only popping due entries.
+
+    schedule = compile_wave(["grunt", "grunt", "tank"], interval=0.8)
+    schedule.pop_due(1.6)   # -> [grunt, grunt] templates
+
+Each entry is (seconds after wave start, EnemyTemplate), sorted by time.
+Entries may share a time: everything due in a tick comes out of one
+pop_due(), which is how big waves spawn in bursts.
+"""
+from collections import namedtuple
+
+from enemy_types import enemy_template
+
+SPAWN_INTERVAL = 0.8  # seconds between spawns (the old per-enemy timer)
+EPSILON = 1e-6        # summed tick dts land a hair under the exact time
+
+SpawnEntry = namedtuple("SpawnEntry", "time template")
+
+
+class SpawnSchedule:
+    def __init__(self, entries):
+        self.entries = sorted(entries, key=lambda e: e.time)  # stable: same-time entries keep wave order
+        self.next = 0  # first entry not spawned yet
+
+    def __len__(self):
+        """Entries still to spawn."""
+        return len(self.entries) - self.next
+
+    @property
+    def done(self):
+        return self.next >= len(self.entries)
+
+    @property
+    def duration(self):
+        return self.entries[-1].time if self.entries else 0.0
+
+    def pop_due(self, wave_time):
+        """Templates of every entry due by wave_time (seconds since the wave started)."""
+        entries = self.entries
+        end = self.next
+        limit = wave_time + EPSILON
+        while end < len(entries) and entries[end].time <= limit:
+            end += 1
+        due = [entry.template for entry in entries[self.next:end]]
+        self.next = end
+        return due
+
+    def enemy_types(self):
+        return [entry.template.name for entry in self.entries]
+
+
+def compile_wave(wave, interval=SPAWN_INTERVAL, times=None):
+    """
+    wave: enemy type names, in spawn order.
+    times: seconds after wave start per enemy; by default one every `interval`,
+    the first after one interval.
+    """
+    if times is None:
+        times = [(i + 1) * interval for i in range(len(wave))]
+    return SpawnSchedule(SpawnEntry(t, enemy_template(name)) for name, t in zip(wave, times))